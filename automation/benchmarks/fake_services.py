@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from aiohttp import web
+
+from . import fixtures
+
+
+class FakeServiceServer:
+    """Local stand-in for the Whisper, YouTube Data, TikTok and Instagram endpoints.
+
+    Runs on its own event loop thread so synchronous clients (googleapiclient, yt-dlp)
+    and the pipeline's own loop can both talk to it.
+    """
+
+    def __init__(self, media_path: Path, transcript_seconds: float = 600.0) -> None:
+        self.media_path = media_path
+        self.transcript = fixtures.synthetic_transcript(transcript_seconds)
+        self.port: int | None = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def media_url(self) -> str:
+        return f"{self.base_url}/media/{self.media_path.name}"
+
+    def env(self) -> dict[str, str]:
+        return {
+            "OPENAI_API_KEY": "bench",
+            "OPENAI_API_BASE": f"{self.base_url}/v1",
+            "YOUTUBE_API_KEY": "bench",
+            "YOUTUBE_API_ENDPOINT": f"{self.base_url}/",
+            "TIKTOK_API_URL": f"{self.base_url}/tiktok/api/feed/search",
+            "INSTAGRAM_API_URL": f"{self.base_url}/instagram/api/trending",
+        }
+
+    def __enter__(self) -> FakeServiceServer:
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._runner is not None:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    async def _start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/v1/audio/transcriptions", self._transcriptions)
+        app.router.add_get("/youtube/v3/search", self._youtube_search)
+        app.router.add_get("/youtube/v3/videos", self._youtube_videos)
+        app.router.add_post("/tiktok/api/feed/search", self._tiktok)
+        app.router.add_get("/instagram/api/trending", self._instagram)
+        app.router.add_static("/media/", self.media_path.parent)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        self.port = sock.getsockname()[1]
+        await web.SockSite(self._runner, sock).start()
+
+    async def _transcriptions(self, request: web.Request) -> web.Response:
+        await request.read()
+        return web.json_response({"text": self.transcript})
+
+    async def _youtube_search(self, request: web.Request) -> web.Response:
+        return web.json_response(fixtures.youtube_search_response(request.query.get("q", "bench")))
+
+    async def _youtube_videos(self, request: web.Request) -> web.Response:
+        video_ids = [video_id for video_id in request.query.get("id", "").split(",") if video_id]
+        return web.json_response(fixtures.youtube_videos_response(video_ids))
+
+    async def _tiktok(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        return web.json_response(fixtures.tiktok_search_response(str(form.get("keywords", "bench")), self.media_url))
+
+    async def _instagram(self, request: web.Request) -> web.Response:
+        niche = request.query.get("tag", "bench")
+        return web.json_response(fixtures.instagram_trending_response(niche, self.media_url))
+
+
+class FakeHookClassifier:
+    """Deterministic stand-in for the transformer hook scorer (scores by punctuation and length)."""
+
+    def __call__(self, prompts, truncation: bool = True, batch_size: int = 1):
+        if isinstance(prompts, str):
+            prompts = [prompts]
+        return [
+            {"label": "hook", "score": min(1.0, 0.6 + 0.1 * prompt.count("?") + 0.002 * len(prompt))}
+            for prompt in prompts
+        ]
+
+
+class FakeUploader:
+    def __init__(self) -> None:
+        self.uploaded = 0
+
+    def schedule_best_time(self) -> datetime:
+        return datetime.utcnow()
+
+    def upload(self, rendered):
+        self.uploaded += 1
+        rendered.youtube_video_id = f"bench_{self.uploaded}"
+        rendered.upload_status = "uploaded"
+        return rendered
+
+
+class FakeAnalytics:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def collect_metrics(self, uploads) -> Path:
+        path = self.root / "analytics" / "bench.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("[]", encoding="utf-8")
+        return path
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import random
+import subprocess
+import wave
+from pathlib import Path
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+SEED = 1337
+
+_VOCABULARY = (
+    "you won't believe what happened next when the market opened this morning "
+    "here is the secret nobody tells beginners about money motivation and focus "
+    "stop scrolling because this changes everything about how you train your brain "
+    "the craziest fact about artificial intelligence is hiding in plain sight"
+).split()
+
+
+def synthetic_transcript(seconds: float, words_per_second: float = 2.5, seed: int = SEED) -> str:
+    rng = random.Random(seed)
+    word_count = max(1, int(seconds * words_per_second))
+    sentences: list[str] = []
+    words: list[str] = []
+    for _ in range(word_count):
+        words.append(rng.choice(_VOCABULARY))
+        if len(words) >= rng.randint(8, 16):
+            sentences.append(" ".join(words).capitalize() + rng.choice([".", ".", "?", "!"]))
+            words = []
+    if words:
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def write_speech_like_wav(path: Path, seconds: float, seed: int = SEED) -> Path:
+    """Noise modulated by a syllable-rate envelope with louder bursts, so energy varies over time."""
+    rng = np.random.default_rng(seed)
+    samples = int(seconds * SAMPLE_RATE)
+    t = np.arange(samples) / SAMPLE_RATE
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4.0 * t) ** 2
+    bursts = np.repeat(rng.uniform(0.2, 1.0, size=int(seconds // 5) + 1), 5 * SAMPLE_RATE)[:samples]
+    signal = rng.standard_normal(samples) * envelope * bursts * 0.3
+    pcm = (np.clip(signal, -1.0, 1.0) * 32767).astype("<i2")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm.tobytes())
+    return path
+
+
+def write_test_video(
+    path: Path, seconds: float, ffmpeg_binary: str = "ffmpeg", size: str = "1280x720", fps: int = 30
+) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        return path
+    args = [
+        ffmpeg_binary,
+        "-y",
+        "-loglevel",
+        "error",
+        "-f",
+        "lavfi",
+        "-i",
+        f"testsrc2=size={size}:rate={fps}",
+        "-f",
+        "lavfi",
+        "-i",
+        "sine=frequency=220:sample_rate=44100",
+        "-t",
+        str(seconds),
+        "-c:v",
+        "libx264",
+        "-preset",
+        "ultrafast",
+        "-pix_fmt",
+        "yuv420p",
+        "-c:a",
+        "aac",
+        "-shortest",
+        str(path),
+    ]
+    subprocess.run(args, check=True)
+    return path
+
+
+def youtube_search_response(niche: str, count: int = 5) -> dict:
+    return {"items": [{"id": {"videoId": f"yt_{niche}_{index}"}} for index in range(count)]}
+
+
+def youtube_videos_response(video_ids: list[str]) -> dict:
+    items = []
+    for index, video_id in enumerate(video_ids):
+        items.append(
+            {
+                "id": video_id,
+                "snippet": {
+                    "title": f"Benchmark video {video_id}",
+                    "channelTitle": "bench-channel",
+                    "publishedAt": "2024-01-01T00:00:00Z",
+                    "defaultAudioLanguage": "en",
+                    "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}},
+                },
+                "statistics": {
+                    "viewCount": str(100_000 * (index + 1)),
+                    "likeCount": str(5_000 * (index + 1)),
+                    "commentCount": str(300 * (index + 1)),
+                },
+                "contentDetails": {"duration": "PT12M30S", "caption": "true"},
+            }
+        )
+    return {"items": items}
+
+
+def tiktok_search_response(niche: str, media_url: str, count: int = 5) -> dict:
+    videos = [
+        {
+            "video_id": f"tt_{niche}_{index}",
+            "play": media_url,
+            "title": f"{niche} clip {index}",
+            "author": {"unique_id": "bench_author"},
+            "language": "en",
+            "cover": None,
+            "duration": 90,
+            "digg_count": 10_000 + index,
+            "share_count": 500,
+            "comment_count": 250,
+            "play_count": 250_000 + index,
+        }
+        for index in range(count)
+    ]
+    return {"data": {"videos": videos}}
+
+
+def instagram_trending_response(niche: str, media_url: str, count: int = 5) -> dict:
+    videos = [
+        {
+            "id": f"ig_{niche}_{index}",
+            "permalink": media_url,
+            "title": f"{niche} reel {index}",
+            "username": "bench_creator",
+            "language": "en",
+            "thumbnail": None,
+            "duration": 75,
+            "likes": 8_000 + index,
+            "plays": 120_000 + index,
+            "comments": 90,
+        }
+        for index in range(count)
+    ]
+    return {"videos": videos}
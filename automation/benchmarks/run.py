@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from . import fixtures
+from .fake_services import FakeAnalytics, FakeHookClassifier, FakeServiceServer, FakeUploader
+
+SCHEMA_VERSION = 1
+AUDIO_LENGTHS = (60, 600, 3600)
+QUICK_AUDIO_LENGTHS = (60,)
+VIDEO_SECONDS = 90
+
+
+def _measure(fn: Callable[[], int], repeat: int) -> dict:
+    """Run ``fn`` ``repeat`` times; ``fn`` returns the number of items it processed."""
+    timings: list[float] = []
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = fn()
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        "runs": repeat,
+        "items": items,
+        "median_seconds": median,
+        "mean_seconds": statistics.fmean(timings),
+        "min_seconds": min(timings),
+        "max_seconds": max(timings),
+        "items_per_second": items / median if median > 0 else 0.0,
+        "timings": timings,
+    }
+
+
+def _configure_environment(workdir: Path, server: FakeServiceServer) -> None:
+    data_root = workdir / "data"
+    tmp_root = workdir / "tmp"
+    for path in (data_root, tmp_root):
+        shutil.rmtree(path, ignore_errors=True)
+    os.environ.update(server.env())
+    os.environ["PIPELINE_DATA_ROOT"] = str(data_root)
+    os.environ["PIPELINE_TMP_ROOT"] = str(tmp_root)
+    os.environ["PIPELINE_RENDER_PROFILE"] = "fast"
+
+    from ..config import get_settings
+    from ..utils.metrics import get_metrics
+
+    get_settings.cache_clear()
+    get_metrics.cache_clear()
+    settings = get_settings()
+    settings.niche_filters = ["motivation", "facts"]
+
+
+def _bench_source(video_path: Path, source_id: str = "bench_source"):
+    from ..data_models import Platform, SourceVideo
+
+    return SourceVideo(
+        id=source_id,
+        platform=Platform.TIKTOK,
+        url="http://127.0.0.1/bench",
+        title="Benchmark source",
+        channel_or_author="bench",
+        language="en",
+        duration_seconds=VIDEO_SECONDS,
+        downloaded_path=video_path,
+    )
+
+
+def bench_detect_segments(fixture_dir: Path, lengths: tuple[int, ...], repeat: int) -> dict[str, dict]:
+    from ..services.segmenter import ViralSegmentDetector
+
+    detector = ViralSegmentDetector()
+    detector.keyword_classifier = FakeHookClassifier()
+    results = {}
+    for seconds in lengths:
+        wav = fixture_dir / f"speech_{seconds}s.wav"
+        if not wav.exists():
+            fixtures.write_speech_like_wav(wav, seconds)
+        transcript = fixtures.synthetic_transcript(seconds)
+        source = _bench_source(wav)
+
+        def run() -> int:
+            detector.detect_segments(source, transcript, wav)
+            return seconds  # audio seconds analysed
+
+        results[f"detect_segments_{seconds}s"] = _measure(run, repeat)
+    return results
+
+
+def bench_extract_audio(video_path: Path, repeat: int) -> dict:
+    from ..services.downloader import VideoDownloader
+
+    downloader = VideoDownloader()
+    source = _bench_source(video_path)
+
+    def run() -> int:
+        asyncio.run(downloader.extract_audio(source))
+        return VIDEO_SECONDS
+
+    return _measure(run, repeat)
+
+
+def bench_stream_audio(video_path: Path, repeat: int) -> dict:
+    """The default ``PIPELINE_AUDIO_STREAMING`` path: ffmpeg PCM fanned out to the energy extractor and spool."""
+    from ..config import get_settings
+    from ..services.audio_stream import WavSpool, fan_out
+    from ..services.downloader import VideoDownloader
+    from ..services.segmenter import StreamingEnergy
+
+    settings = get_settings()
+    downloader = VideoDownloader()
+    source = _bench_source(video_path)
+
+    def run() -> int:
+        energy = StreamingEnergy()
+        spool = WavSpool(settings.audio_spool_max_bytes, settings.tmp_root / "audio")
+        try:
+            asyncio.run(fan_out(downloader.stream_audio(source), energy.feed, spool.feed))
+            energy.finalize()
+            spool.finalize()
+        finally:
+            spool.close()
+        return VIDEO_SECONDS
+
+    return _measure(run, repeat)
+
+
+def bench_render(video_path: Path, repeat: int) -> dict:
+    from ..data_models import ViralSegment
+    from ..services.editor import ShortRenderer
+
+    renderer = ShortRenderer()
+    source = _bench_source(video_path)
+    segment = ViralSegment(
+        source_video_id=source.id,
+        start_time=5.0,
+        end_time=20.0,
+        hook_score=0.9,
+        energy_score=0.8,
+        keywords=["benchmark"],
+        transcript_snippet=fixtures.synthetic_transcript(15),
+    )
+
+    def run() -> int:
+        renderer.render(source, segment)
+        return 1
+
+    return _measure(run, repeat)
+
+
+def bench_collectors(repeat: int) -> dict:
+    from ..config import get_settings
+    from ..services.collectors import TrendingCollector
+
+    collector = TrendingCollector()
+    niches = get_settings().niche_filters
+
+    async def collect_all() -> int:
+        collector.state.reset()  # measure a cold scan, not the incremental no-change path
+        youtube = await asyncio.to_thread(collector.fetch_youtube_trending, niches)
+        tiktok, instagram = await asyncio.gather(
+            collector.fetch_tiktok_trending(niches), collector.fetch_instagram_trending(niches)
+        )
+        return len(youtube) + len(tiktok) + len(instagram)
+
+    return _measure(lambda: asyncio.run(collect_all()), repeat)
+
+
+def bench_pipeline_run(workdir: Path, repeat: int) -> dict:
+    from ..config import get_settings
+    from ..pipeline import Pipeline
+
+    settings = get_settings()
+    # YouTube watch URLs cannot be fetched offline; benchmark end-to-end on the proxied platforms.
+    settings.youtube_api_key = None
+
+    def run() -> int:
+        # Cold start each repeat: otherwise the collector and prefilter skip already-seen sources.
+        for state_file in ("collector_state.json", "used_sources.json"):
+            (workdir / "data" / state_file).unlink(missing_ok=True)
+        for area in ("runs", "downloads"):
+            shutil.rmtree(workdir / "data" / area, ignore_errors=True)
+        pipeline = Pipeline()
+        pipeline.segmenter.keyword_classifier = FakeHookClassifier()
+        pipeline.uploader = FakeUploader()
+        pipeline.analytics = FakeAnalytics(workdir / "data")
+        return len(asyncio.run(pipeline.run()))
+
+    return _measure(run, repeat)
+
+
+def compare(current: dict, baseline: dict, max_regression: float) -> list[str]:
+    regressions = []
+    print(f"{'benchmark':<32} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in sorted(current["benchmarks"].items()):
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            print(f"{name:<32} {'-':>10} {result['median_seconds']:>10.3f} {'new':>8}")
+            continue
+        change = result["median_seconds"] / max(previous["median_seconds"], 1e-9) - 1
+        flag = " REGRESSION" if change > max_regression else ""
+        print(
+            f"{name:<32} {previous['median_seconds']:>10.3f} {result['median_seconds']:>10.3f} "
+            f"{change:>+8.1%}{flag}"
+        )
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the pipeline hot paths")
+    parser.add_argument("--output", type=Path, default=None, help="Where to write the results JSON")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed median slowdown (0.2 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quick", action="store_true", help="Only the short fixtures")
+    parser.add_argument(
+        "--only",
+        default="detect,extract_audio,stream_audio,render,collectors,pipeline",
+        help="Comma-separated subset of detect,extract_audio,stream_audio,render,collectors,pipeline",
+    )
+    parser.add_argument(
+        "--workdir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "pipeline-bench",
+        help="Fixture cache and scratch data root (fixtures are reused between invocations)",
+    )
+    args = parser.parse_args(argv)
+
+    results_dir = Path(os.getenv("PIPELINE_DATA_ROOT", "data")) / "benchmarks"
+    output = args.output or results_dir / f"bench_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.json"
+    selected = {name.strip() for name in args.only.split(",") if name.strip()}
+    fixture_dir = args.workdir / "fixtures"
+    video_path = fixtures.write_test_video(
+        fixture_dir / f"testsrc_{VIDEO_SECONDS}s.mp4", VIDEO_SECONDS, os.getenv("FFMPEG_BIN", "ffmpeg")
+    )
+
+    benchmarks: dict[str, dict] = {}
+    with FakeServiceServer(video_path) as server:
+        _configure_environment(args.workdir, server)
+        if "detect" in selected:
+            lengths = QUICK_AUDIO_LENGTHS if args.quick else AUDIO_LENGTHS
+            benchmarks.update(bench_detect_segments(fixture_dir, lengths, args.repeat))
+        if "extract_audio" in selected:
+            benchmarks["extract_audio_90s"] = bench_extract_audio(video_path, args.repeat)
+        if "stream_audio" in selected:
+            benchmarks["stream_audio_90s"] = bench_stream_audio(video_path, args.repeat)
+        if "render" in selected:
+            benchmarks["render_15s"] = bench_render(video_path, args.repeat)
+        if "collectors" in selected:
+            benchmarks["collectors"] = bench_collectors(args.repeat)
+        if "pipeline" in selected:
+            benchmarks["pipeline_run"] = bench_pipeline_run(args.workdir, 1 if args.quick else args.repeat)
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "git_commit": _git_commit(),
+        "host": {"python": sys.version.split()[0], "platform": platform.platform(), "cpu_count": os.cpu_count()},
+        "benchmarks": benchmarks,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Wrote benchmark results to {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if compare(report, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
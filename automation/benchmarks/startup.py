@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+
+ENTRYPOINTS = ("automation.main", "automation.scheduler")
+HEAVY_MODULES = ("torch", "transformers", "librosa", "moviepy", "googleapiclient")
+DEFAULT_BUDGET_SECONDS = 1.0
+
+# Runs in a fresh interpreter so modules imported by this process cannot mask a regression.
+PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+for name in {entrypoints!r}:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+heavy = sorted({{name.split(".")[0] for name in sys.modules}} & set({heavy!r}))
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure() -> dict:
+    probe = PROBE.format(entrypoints=ENTRYPOINTS, heavy=HEAVY_MODULES)
+    completed = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(ENTRYPOINTS)} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check that the CLI entrypoints import quickly and lazily")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS, help="Maximum import time in seconds")
+    args = parser.parse_args(argv)
+
+    result = measure()
+    print(f"Imported {', '.join(ENTRYPOINTS)} in {result['seconds']:.3f}s (budget {args.budget:.3f}s)")
+    failed = False
+    if result["heavy"]:
+        print(f"Heavy modules imported at startup: {', '.join(result['heavy'])}")
+        failed = True
+    if result["seconds"] > args.budget:
+        print("Import time exceeds budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
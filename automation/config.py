@@ -2,7 +2,25 @@ import os
 from functools import lru_cache
 from pathlib import Path
 
-from pydantic import BaseSettings, Field, validator
+from pydantic import BaseModel, BaseSettings, Field, validator
+
+
+class RenderProfile(BaseModel):
+    """Encoder settings for one render quality/speed trade-off."""
+
+    preset: str
+    crf: int
+    tune: str | None = None
+    threads: int | None = None  # None sizes threads from the CPU count
+    fps: int = 30
+
+
+def default_render_profiles() -> dict[str, RenderProfile]:
+    return {
+        "draft": RenderProfile(preset="ultrafast", crf=30, tune="fastdecode", fps=24),
+        "fast": RenderProfile(preset="veryfast", crf=23),
+        "final": RenderProfile(preset="medium", crf=20),
+    }
 
 
 class Settings(BaseSettings):
@@ -14,10 +32,21 @@ class Settings(BaseSettings):
     youtube_client_secret_path: Path | None = Field(
         default=None, env="YOUTUBE_CLIENT_SECRET_PATH"
     )
+    youtube_api_endpoint: str | None = Field(default=None, env="YOUTUBE_API_ENDPOINT")
     openai_api_key: str | None = Field(default=None, env="OPENAI_API_KEY")
+    openai_api_base: str = Field(default="https://api.openai.com/v1", env="OPENAI_API_BASE")
+    tiktok_api_url: str = Field(default="https://www.tikwm.com/api/feed/search", env="TIKTOK_API_URL")
+    instagram_api_url: str = Field(default="https://www.instaviews.io/api/trending", env="INSTAGRAM_API_URL")
     replicate_api_token: str | None = Field(default=None, env="REPLICATE_API_TOKEN")
     ffmpeg_binary: str = Field(default=os.getenv("FFMPEG_BIN", "ffmpeg"))
     scheduler_cron: str = Field(default="0 12 * * *", env="PIPELINE_CRON")
+    scheduler_mode: str = Field(default="daily", env="PIPELINE_SCHEDULER_MODE")
+    scheduler_collect_cron: str = Field(default="*/30 * * * *", env="PIPELINE_COLLECT_CRON")
+    scheduler_analytics_cron: str = Field(default="0 * * * *", env="PIPELINE_ANALYTICS_CRON")
+    scheduler_batch_seconds: int = Field(default=300, env="PIPELINE_BATCH_SECONDS")
+    scheduler_batch_tasks: int = Field(default=20, env="PIPELINE_BATCH_TASKS")
+    scheduler_max_queue_depth: int = Field(default=10, env="PIPELINE_MAX_QUEUE_DEPTH")
+    scheduler_misfire_grace_seconds: int = Field(default=15 * 60, env="PIPELINE_MISFIRE_GRACE_SECONDS")
     niche_filters: list[str] = Field(
         default_factory=lambda: [
             "motivation",
@@ -29,10 +58,54 @@ class Settings(BaseSettings):
             "finance",
         ]
     )
+    collector_track_days: int = Field(default=7, env="PIPELINE_COLLECTOR_TRACK_DAYS")
+    collector_refresh_minutes: int = Field(default=60, env="PIPELINE_COLLECTOR_REFRESH_MINUTES")
+    collector_search_minutes: int = Field(default=360, env="PIPELINE_COLLECTOR_SEARCH_MINUTES")
+    collector_resurface_views_per_hour: float = Field(default=1000.0, env="PIPELINE_COLLECTOR_RESURFACE_VIEWS_PER_HOUR")
     prefer_languages: list[str] = Field(default_factory=lambda: ["en", "hi"])
+    prefilter_min_duration_seconds: int = Field(default=30, env="PIPELINE_PREFILTER_MIN_DURATION")
+    prefilter_max_duration_seconds: int = Field(default=3 * 60 * 60, env="PIPELINE_PREFILTER_MAX_DURATION")
+    prefilter_strict_language: bool = Field(default=False, env="PIPELINE_PREFILTER_STRICT_LANGUAGE")
+    prefilter_require_captions: bool = Field(default=False, env="PIPELINE_PREFILTER_REQUIRE_CAPTIONS")
+    prefilter_check_thumbnails: bool = Field(default=True, env="PIPELINE_PREFILTER_CHECK_THUMBNAILS")
     watermark_path: Path | None = Field(default=None, env="WATERMARK_PATH")
     brand_primary_hex: str = Field(default="#FF4D00")
     brand_secondary_hex: str = Field(default="#222222")
+    render_profiles: dict[str, RenderProfile] = Field(default_factory=default_render_profiles)
+    render_profile: str = Field(default="final", env="PIPELINE_RENDER_PROFILE")
+    render_concurrency: int = Field(default=1, env="PIPELINE_RENDER_CONCURRENCY")
+    smart_reframe: bool = Field(default=True, env="PIPELINE_SMART_REFRAME")
+    audio_streaming: bool = Field(default=True, env="PIPELINE_AUDIO_STREAMING")
+    audio_spool_max_bytes: int = Field(default=64 * 1024 * 1024, env="PIPELINE_AUDIO_SPOOL_MAX_BYTES")
+    storage_min_free_mb: int = Field(default=2048, env="PIPELINE_STORAGE_MIN_FREE_MB")
+    storage_quotas_mb: dict[str, int] = Field(
+        default_factory=lambda: {
+            "downloads": 20_000,
+            "audio": 2_000,
+            "transcripts": 500,
+            "shorts": 10_000,
+            "analytics": 200,
+            "runs": 500,
+            "cache": 2_000,
+        }
+    )
+    storage_max_age_days: dict[str, int] = Field(
+        default_factory=lambda: {
+            "downloads": 7,
+            "audio": 1,
+            "transcripts": 30,
+            "shorts": 30,
+            "analytics": 30,
+            "runs": 90,
+            "cache": 30,
+        }
+    )
+    queue_url: str | None = Field(default=None, env="PIPELINE_QUEUE_URL")
+    task_max_attempts: int = Field(default=3, env="PIPELINE_TASK_MAX_ATTEMPTS")
+    task_lease_seconds: int = Field(default=2 * 60 * 60, env="PIPELINE_TASK_LEASE_SECONDS")
+    worker_poll_seconds: float = Field(default=5.0, env="PIPELINE_WORKER_POLL_SECONDS")
+    log_level: str = Field(default="INFO", env="PIPELINE_LOG_LEVEL")
+    log_debug_sample_rate: float = Field(default=0.1, env="PIPELINE_LOG_DEBUG_SAMPLE_RATE")
 
     class Config:
         env_file = ".env"
@@ -44,6 +117,23 @@ class Settings(BaseSettings):
         path.mkdir(parents=True, exist_ok=True)
         return path
 
+    @validator("render_profile")
+    def known_render_profile(cls, value: str, values: dict) -> str:
+        profiles = values.get("render_profiles") or default_render_profiles()
+        if value not in profiles:
+            raise ValueError(f"Unknown render profile {value!r}; expected one of {sorted(profiles)}")
+        return value
+
+    @validator("scheduler_mode")
+    def known_scheduler_mode(cls, value: str) -> str:
+        if value not in ("daily", "continuous"):
+            raise ValueError(f"Unknown scheduler mode {value!r}; expected 'daily' or 'continuous'")
+        return value
+
+    @property
+    def active_render_profile(self) -> RenderProfile:
+        return self.render_profiles[self.render_profile]
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -24,6 +24,8 @@ class SourceVideo(BaseModel):
     language: str | None = None
     thumbnail_url: HttpUrl | None = None
     duration_seconds: int | None = None
+    category_id: str | None = None
+    has_captions: bool | None = None
     metrics: dict[str, Any] = {}
     downloaded_path: Path | None = None
     transcript_path: Path | None = None
@@ -63,4 +65,5 @@ class PipelineResult(BaseModel):
     segments: list[ViralSegment]
     rendered_shorts: list[RenderedShort]
     analytics: dict[str, Any] = {}
+    stage_metrics: list[dict[str, Any]] = []
     completed_at: datetime = datetime.utcnow()
@@ -1,16 +1,64 @@
+import argparse
 import asyncio
+import json
 
+from .config import get_settings
 from .pipeline import Pipeline
-from .utils.logging import setup_logger
+from .utils.logging import get_logger, setup_logger
 
-logger = setup_logger("main")
+logger = get_logger("main")
+
+
+def status() -> dict:
+    from .services.run_index import RunIndex
+
+    settings = get_settings()
+    runs_dir = settings.data_root / "runs"
+    index = RunIndex().load()
+    latest = index["runs"][0] if index["runs"] else None
+    progress_path = runs_dir / "progress.json"
+    return {
+        "latest_run": str(runs_dir / latest["runFile"]) if latest else None,
+        "latest_run_at": latest["completedAt"] if latest else None,
+        "run_count": index["totals"]["runs"],
+        "latest_summary": latest,
+        "progress": json.loads(progress_path.read_text(encoding="utf-8")) if progress_path.exists() else None,
+    }
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the viral shorts pipeline once")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--distributed",
+        action="store_true",
+        help="Collect sources and enqueue download tasks for stage workers instead of processing in-process",
+    )
+    mode.add_argument("--collect-only", action="store_true", help="Collect and persist trending sources, then exit")
+    mode.add_argument("--analytics", action="store_true", help="Refresh analytics for recently uploaded shorts")
+    mode.add_argument("--status", action="store_true", help="Print the latest run status as JSON and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        print(json.dumps(status(), indent=2))
+        return
+
+    setup_logger("main")
     pipeline = Pipeline()
-    asyncio.run(pipeline.run())
+    if args.collect_only:
+        sources = asyncio.run(pipeline.collect())
+        logger.info("Collected %d sources", len(sources))
+    elif args.analytics:
+        path = pipeline.refresh_analytics()
+        logger.info("Analytics snapshot: %s", path or "no uploads to track")
+    elif args.distributed:
+        from .task_queue import get_task_queue
+
+        asyncio.run(pipeline.enqueue(get_task_queue()))
+    else:
+        logger.info("Triggering single pipeline run")
+        asyncio.run(pipeline.run())
 
 
 if __name__ == "__main__":
-    logger.info("Triggering single pipeline run")
     main()
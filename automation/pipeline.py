@@ -1,82 +1,286 @@
 from __future__ import annotations
 
 import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
 
 from .config import get_settings
 from .data_models import PipelineResult, RenderedShort, SourceVideo, ViralSegment
-from .services.analytics import AnalyticsTracker
-from .services.collectors import TrendingCollector
-from .services.downloader import VideoDownloader
-from .services.editor import ShortRenderer
-from .services.metadata import MetadataGenerator
-from .services.segmenter import ViralSegmentDetector
-from .services.transcript import TranscriptGenerator
-from .services.uploader import YouTubeUploader
-from .utils.logging import setup_logger
+from .utils.logging import get_logger, log_context
+from .utils.metrics import get_metrics
+
+if TYPE_CHECKING:
+    from .services.analytics import AnalyticsTracker
+    from .services.collectors import TrendingCollector
+    from .services.downloader import VideoDownloader
+    from .services.editor import ShortRenderer
+    from .services.prefilter import SourcePrefilter
+    from .services.run_index import RunIndex, RunProgress
+    from .services.segmenter import ViralSegmentDetector
+    from .services.storage import StorageManager
+    from .services.transcript import TranscriptGenerator
+    from .services.uploader import YouTubeUploader
+    from .task_queue import TaskQueue
+
+logger = get_logger("pipeline")
 
-logger = setup_logger("pipeline")
+SOURCES_PER_RUN = 5
+SHORTS_PER_SOURCE = 2
 
 
 class Pipeline:
     def __init__(self) -> None:
+        # Services (and their heavy dependencies: torch, moviepy, googleapiclient, ...) are
+        # imported and built on first use, so a command or worker only loads what it touches.
         self.settings = get_settings()
-        self.collector = TrendingCollector()
-        self.downloader = VideoDownloader()
-        self.transcript_generator = TranscriptGenerator()
-        self.segmenter = ViralSegmentDetector()
-        self.renderer = ShortRenderer()
-        self.uploader = YouTubeUploader()
-        self.analytics = AnalyticsTracker()
+        self.metrics = get_metrics()
+
+    @cached_property
+    def collector(self) -> TrendingCollector:
+        from .services.collectors import TrendingCollector
+
+        return TrendingCollector()
+
+    @cached_property
+    def prefilter(self) -> SourcePrefilter:
+        from .services.prefilter import SourcePrefilter
+
+        return SourcePrefilter()
+
+    @cached_property
+    def downloader(self) -> VideoDownloader:
+        from .services.downloader import VideoDownloader
+
+        return VideoDownloader()
+
+    @cached_property
+    def transcript_generator(self) -> TranscriptGenerator:
+        from .services.transcript import TranscriptGenerator
+
+        return TranscriptGenerator()
+
+    @cached_property
+    def segmenter(self) -> ViralSegmentDetector:
+        from .services.segmenter import ViralSegmentDetector
+
+        return ViralSegmentDetector()
+
+    @cached_property
+    def renderer(self) -> ShortRenderer:
+        from .services.editor import ShortRenderer
+
+        return ShortRenderer()
+
+    @cached_property
+    def uploader(self) -> YouTubeUploader:
+        from .services.uploader import YouTubeUploader
+
+        return YouTubeUploader()
+
+    @cached_property
+    def analytics(self) -> AnalyticsTracker:
+        from .services.analytics import AnalyticsTracker
+
+        return AnalyticsTracker()
+
+    @cached_property
+    def run_index(self) -> RunIndex:
+        from .services.run_index import RunIndex
+
+        return RunIndex()
+
+    @cached_property
+    def progress(self) -> RunProgress:
+        from .services.run_index import RunProgress
+
+        return RunProgress()
+
+    @cached_property
+    def storage(self) -> StorageManager:
+        from .services.storage import StorageManager
+
+        return StorageManager()
 
     async def run(self) -> list[PipelineResult]:
         logger.info("Starting pipeline run")
-        sources = self.collector.fetch_youtube_trending(self.settings.niche_filters)
-        tiktok, instagram = await asyncio.gather(
-            self.collector.fetch_tiktok_trending(self.settings.niche_filters),
-            self.collector.fetch_instagram_trending(self.settings.niche_filters),
-        )
-        sources.extend(tiktok)
-        sources.extend(instagram)
-        self.collector.persist_sources(sources)
-
+        self.progress.start(sources_total=0)
         results: list[PipelineResult] = []
-        for source in sources[:5]:
-            try:
-                result = await self._process_source(source)
-                results.append(result)
-            except Exception as exc:  # noqa: BLE001
-                logger.exception("Failed processing %s: %s", source.id, exc)
-        await self._persist_results(results)
+        run_path: Path | None = None
+        try:
+            sources = await self.select_sources(limit=SOURCES_PER_RUN)
+            self.prefilter.mark_used(sources)
+            self.progress.update(sourcesTotal=len(sources))
+            for source in sources:
+                try:
+                    result = await self._process_source(source)
+                    results.append(result)
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("Failed processing %s: %s", source.id, exc)
+                    result = None
+                self.progress.advance(result)
+            run_path = await self.persist_results(results)
+        finally:
+            self.progress.finish(run_path.stem if run_path else None)
+        self.storage.collect_garbage()
+        self.metrics.write_prometheus("pipeline")
         logger.info("Pipeline finished with %d results", len(results))
         return results
 
+    async def collect(self) -> list[SourceVideo]:
+        with self.metrics.span("collect") as span:
+            sources = self.collector.fetch_youtube_trending(self.settings.niche_filters)
+            tiktok, instagram = await asyncio.gather(
+                self.collector.fetch_tiktok_trending(self.settings.niche_filters),
+                self.collector.fetch_instagram_trending(self.settings.niche_filters),
+            )
+            sources.extend(tiktok)
+            sources.extend(instagram)
+            # Fastest-growing first: observed views/hour, falling back to the snapshot score.
+            sources.sort(
+                key=lambda source: (
+                    source.metrics.get("view_velocity") or 0.0,
+                    source.metrics.get("velocity_score") or 0.0,
+                ),
+                reverse=True,
+            )
+            self.collector.save_state()
+            self.collector.persist_sources(sources)
+            span.items = len(sources)
+        return sources
+
+    async def select_sources(self, limit: int | None = None) -> list[SourceVideo]:
+        """Collect, then keep the top ``limit`` sources the prefilter accepts before anything is downloaded."""
+        sources = await self.collect()
+        with self.metrics.span("prefilter") as span:
+            sources = await self.prefilter.filter(sources, limit=limit)
+            span.items = len(sources)
+        return sources
+
+    async def enqueue(self, queue: TaskQueue) -> int:
+        """Coordinator mode: collect sources and hand them to stage workers via the queue."""
+        logger.info("Collecting sources for distributed run")
+        sources = await self.select_sources(limit=SOURCES_PER_RUN)
+        for source in sources:
+            queue.enqueue("download", {"source": json.loads(source.json())})
+        self.prefilter.mark_used(sources)
+        logger.info("Enqueued %d download tasks", len(sources))
+        return len(sources)
+
     async def _process_source(self, source: SourceVideo) -> PipelineResult:
-        source = self.downloader.download(source)
-        audio_path = await self.downloader.extract_audio(source)
-        transcript_path = await self.transcript_generator.generate(source, audio_path)
-        transcript_text = self.transcript_generator.load_transcript_text(transcript_path)
+        progress = self.progress
+        with log_context(source_id=source.id):
+            progress.update(stage="download", sourceId=source.id)
+            source = self.download(source)
+            with self.storage.pin(source.downloaded_path):
+                progress.update(stage="transcribe")
+                audio_path, energy_path, transcript_path = await self.transcribe(source)
+                progress.update(stage="detect")
+                segments = self.detect(source, transcript_path, audio_path=audio_path, energy_path=energy_path)
+                progress.update(stage="render")
+                rendered_shorts = self.render_segments(source, segments)
+                progress.update(stage="upload")
+                return self.publish(source, segments, rendered_shorts)
+
+    def download(self, source: SourceVideo) -> SourceVideo:
+        self.storage.ensure_download_space(source)
+        with self.metrics.span("download", source.id) as span:
+            source = self.downloader.download(source)
+            span.items = 1
+        return source
 
-        segments = self.segmenter.detect_segments(source, transcript_text, audio_path)
-        rendered_shorts = self._render_segments(source, segments)
+    async def transcribe(self, source: SourceVideo) -> tuple[Path | None, Path | None, Path]:
+        """Extract audio and transcribe.
+
+        Returns ``(audio_path, energy_path, transcript_path)``; streaming runs keep no WAV and set
+        ``energy_path`` instead of ``audio_path``.
+        """
+        if self.settings.audio_streaming:
+            return await self._transcribe_streaming(source)
+        with self.metrics.span("extract_audio", source.id) as span:
+            audio_path = await self.downloader.extract_audio(source)
+            span.items = 1
+        with self.metrics.span("transcribe", source.id) as span:
+            transcript_path = await self.transcript_generator.generate(source, audio_path)
+            span.items = 1
+        return audio_path, None, transcript_path
+
+    async def _transcribe_streaming(self, source: SourceVideo) -> tuple[None, Path, Path]:
+        from .services.audio_stream import WavSpool, fan_out
+        from .services.segmenter import StreamingEnergy
+
+        # ffmpeg PCM is fanned out chunk by chunk to the energy extractor and the upload spool,
+        # so the WAV is never written and re-read just to compute energy.
+        audio_dir = self.settings.tmp_root / "audio"
+        energy = StreamingEnergy()
+        spool = WavSpool(self.settings.audio_spool_max_bytes, audio_dir)
+        try:
+            with self.metrics.span("extract_audio", source.id) as span:
+                await fan_out(self.downloader.stream_audio(source), energy.feed, spool.feed)
+                energy_path = audio_dir / f"{source.id}.energy.npy"
+                audio_dir.mkdir(parents=True, exist_ok=True)
+                np.save(energy_path, energy.finalize())
+                span.items = 1
+            with self.metrics.span("transcribe", source.id) as span:
+                transcript_path = await self.transcript_generator.generate(source, spool.finalize())
+                span.items = 1
+        finally:
+            spool.close()
+        return None, energy_path, transcript_path
+
+    def detect(
+        self,
+        source: SourceVideo,
+        transcript_path: Path,
+        audio_path: Path | None = None,
+        energy_path: Path | None = None,
+    ) -> list[ViralSegment]:
+        with self.metrics.span("detect", source.id) as span:
+            transcript_text = self.transcript_generator.load_transcript_text(transcript_path)
+            energy = np.load(energy_path) if energy_path else None
+            segments = self.segmenter.detect_segments(source, transcript_text, audio_path=audio_path, energy=energy)
+            span.items = len(segments)
+        return segments
+
+    def publish(
+        self, source: SourceVideo, segments: list[ViralSegment], rendered_shorts: list[RenderedShort]
+    ) -> PipelineResult:
         uploaded_shorts = self._upload_rendered(rendered_shorts)
-        analytics_path = self.analytics.collect_metrics(uploaded_shorts)
-        return PipelineResult(
+        with self.metrics.span("analytics", source.id) as span:
+            analytics_path = self.analytics.collect_metrics(uploaded_shorts)
+            span.items = len(uploaded_shorts)
+        result = PipelineResult(
             source=source,
             segments=segments,
             rendered_shorts=uploaded_shorts,
             analytics={"path": str(analytics_path)},
+            stage_metrics=self.metrics.spans_for(source.id),
             completed_at=datetime.utcnow(),
         )
+        if len(uploaded_shorts) == len(rendered_shorts):
+            self.storage.release_source(result)
+        return result
 
-    def _render_segments(self, source: SourceVideo, segments: list[ViralSegment]) -> list[RenderedShort]:
+    def render_segments(self, source: SourceVideo, segments: list[ViralSegment]) -> list[RenderedShort]:
         shorts = []
-        for segment in segments[:2]:
-            try:
-                shorts.append(self.renderer.render(source, segment))
-            except Exception as exc:  # noqa: BLE001
-                logger.error("Render failed for segment %s: %s", segment.start_time, exc)
+        segments = segments[:SHORTS_PER_SOURCE]
+        self.storage.ensure_render_space(sum(segment.end_time - segment.start_time for segment in segments))
+        # Split encoder threads by the renders actually running, not the configured pool size.
+        workers = max(1, min(self.settings.render_concurrency, len(segments)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                (segment, executor.submit(self.renderer.render, source, segment, workers)) for segment in segments
+            ]
+            for segment, future in futures:
+                try:
+                    shorts.append(future.result())
+                except Exception as exc:  # noqa: BLE001
+                    logger.error("Render failed for segment %s: %s", segment.start_time, exc)
         return shorts
 
     def _upload_rendered(self, shorts: list[RenderedShort]) -> list[RenderedShort]:
@@ -87,12 +291,31 @@ class Pipeline:
             if short.scheduled_time is None:
                 short.scheduled_time = self.uploader.schedule_best_time()
             try:
-                uploaded.append(self.uploader.upload(short))
+                with self.metrics.span("upload", short.segment.source_video_id) as span:
+                    uploaded.append(self.uploader.upload(short))
+                    span.items = 1
             except Exception as exc:  # noqa: BLE001
                 logger.error("Upload failed: %s", exc)
         return uploaded
 
-    async def _persist_results(self, results: list[PipelineResult]) -> Path:
+    def refresh_analytics(self, days: int = 7) -> Path | None:
+        """Snapshot analytics for every short uploaded by runs archived in the last ``days``."""
+        cutoff = datetime.utcnow().timestamp() - days * 86400
+        uploads: list[RenderedShort] = []
+        for run_path in sorted((self.settings.data_root / "runs").glob("run_*.json")):
+            if run_path.stat().st_mtime < cutoff:
+                continue
+            for record in json.loads(run_path.read_text(encoding="utf-8")):
+                result = PipelineResult.parse_obj(record)
+                uploads += [short for short in result.rendered_shorts if short.youtube_video_id]
+        if not uploads:
+            return None
+        with self.metrics.span("analytics") as span:
+            path = self.analytics.collect_metrics(uploads)
+            span.items = len(uploads)
+        return path
+
+    async def persist_results(self, results: list[PipelineResult]) -> Path:
         archive_dir = self.settings.data_root / "runs"
         archive_dir.mkdir(parents=True, exist_ok=True)
         path = archive_dir / f"run_{datetime.utcnow().isoformat()}.json"
@@ -100,5 +323,6 @@ class Pipeline:
             "[\n" + ",\n".join([result.json(indent=2) for result in results]) + "\n]",
             encoding="utf-8",
         )
+        self.run_index.record(path, results)
         logger.info("Persisted run details to %s", path)
         return path
@@ -1,29 +1,85 @@
 from __future__ import annotations
 
 import asyncio
+import sys
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
-from .pipeline import Pipeline
-from .utils.logging import setup_logger
+from .config import get_settings
+from .task_queue import get_task_queue
+from .utils.logging import get_logger, setup_logger
 
-logger = setup_logger("scheduler")
+logger = get_logger("scheduler")
+
+
+async def run_module(module: str, *args: str) -> int:
+    # Each run gets its own interpreter so torch, moviepy and model weights are released
+    # when it exits instead of staying resident in the long-lived scheduler process.
+    process = await asyncio.create_subprocess_exec(sys.executable, "-m", module, *args)
+    returncode = await process.wait()
+    if returncode != 0:
+        logger.error("%s %s exited with status %s", module, " ".join(args), returncode)
+    return returncode
 
 
 async def run_pipeline() -> None:
-    pipeline = Pipeline()
-    await pipeline.run()
+    await run_module("automation.main")
+
+
+async def collect_sources() -> None:
+    """Collect and enqueue new sources unless the render backlog is deeper than workers can drain."""
+    # Rendering is the slow stage; cheap download/detect tasks should not hold back collection.
+    depth = await asyncio.to_thread(get_task_queue().depth, ["render"])
+    limit = get_settings().scheduler_max_queue_depth
+    if depth >= limit:
+        logger.info("Skipping collection: %d queued render tasks (limit %d)", depth, limit)
+        return
+    await run_module("automation.main", "--distributed")
+
+
+async def process_batch() -> None:
+    """Drain a bounded batch of queued stage tasks in a short-lived worker."""
+    if not await asyncio.to_thread(get_task_queue().depth):
+        return
+    batch = str(get_settings().scheduler_batch_tasks)
+    await run_module("automation.worker", "--exit-when-idle", "--max-tasks", batch)
+
+
+async def refresh_analytics() -> None:
+    await run_module("automation.main", "--analytics")
 
 
 def start_scheduler() -> AsyncIOScheduler:
-    scheduler = AsyncIOScheduler()
-    scheduler.add_job(run_pipeline, "cron", hour=12, minute=0, id="daily_pipeline")
+    settings = get_settings()
+    # One instance per job; missed or overlapping ticks collapse into a single catch-up run.
+    scheduler = AsyncIOScheduler(
+        job_defaults={
+            "max_instances": 1,
+            "coalesce": True,
+            "misfire_grace_time": settings.scheduler_misfire_grace_seconds,
+        }
+    )
+    if settings.scheduler_mode == "continuous":
+        scheduler.add_job(collect_sources, CronTrigger.from_crontab(settings.scheduler_collect_cron), id="collect")
+        scheduler.add_job(
+            process_batch, IntervalTrigger(seconds=settings.scheduler_batch_seconds), id="process_batch"
+        )
+    else:
+        scheduler.add_job(run_pipeline, CronTrigger.from_crontab(settings.scheduler_cron), id="daily_pipeline")
+    scheduler.add_job(refresh_analytics, CronTrigger.from_crontab(settings.scheduler_analytics_cron), id="analytics")
     scheduler.start()
-    logger.info("Scheduler started with daily pipeline job")
+    logger.info(
+        "Scheduler started in %s mode with jobs %s",
+        settings.scheduler_mode,
+        ", ".join(job.id for job in scheduler.get_jobs()),
+    )
     return scheduler
 
 
 def main() -> None:
+    setup_logger("scheduler")
     loop = asyncio.get_event_loop()
     scheduler = start_scheduler()
     try:
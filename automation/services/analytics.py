@@ -9,9 +9,9 @@ from googleapiclient.discovery import build
 
 from ..config import get_settings
 from ..data_models import RenderedShort
-from ..utils.logging import setup_logger
+from ..utils.logging import get_logger
 
-logger = setup_logger("analytics")
+logger = get_logger("analytics")
 
 
 class AnalyticsTracker:
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import io
+import struct
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Callable
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # s16le
+WAV_HEADER_BYTES = 44
+
+
+def wav_header(data_bytes: int, sample_rate: int = SAMPLE_RATE, channels: int = 1) -> bytes:
+    byte_rate = sample_rate * channels * SAMPLE_WIDTH
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_bytes,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        channels,
+        sample_rate,
+        byte_rate,
+        channels * SAMPLE_WIDTH,
+        SAMPLE_WIDTH * 8,
+        b"data",
+        data_bytes,
+    )
+
+
+class WavSpool:
+    """Accumulates streamed PCM as a WAV in memory, spilling to a temp file past ``max_bytes``.
+
+    Only consumers that need a file-like upload read it back; nothing touches disk for
+    sources whose audio fits in memory.
+    """
+
+    def __init__(self, max_bytes: int, spill_dir: Path) -> None:
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.data_bytes = 0
+        self._buffer = bytearray(WAV_HEADER_BYTES)
+        self._file: BinaryIO | None = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def feed(self, chunk: bytes) -> None:
+        self.data_bytes += len(chunk)
+        if self._file is not None:
+            self._file.write(chunk)
+            return
+        self._buffer += chunk
+        if len(self._buffer) > self.max_bytes:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._file = tempfile.NamedTemporaryFile(dir=self.spill_dir, suffix=".wav")
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+
+    def finalize(self) -> BinaryIO:
+        header = wav_header(self.data_bytes)
+        if self._file is None:
+            self._buffer[:WAV_HEADER_BYTES] = header
+            return io.BytesIO(self._buffer)
+        self._file.seek(0)
+        self._file.write(header)
+        self._file.flush()
+        self._file.seek(0)
+        return self._file
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()  # NamedTemporaryFile deletes itself on close
+        self._buffer = bytearray()
+
+
+async def fan_out(chunks: AsyncIterator[bytes], *sinks: Callable[[bytes], None]) -> int:
+    """Feed every PCM chunk to each sink as it arrives; returns the number of bytes streamed."""
+    total = 0
+    async for chunk in chunks:
+        total += len(chunk)
+        for sink in sinks:
+            sink(chunk)
+    return total
+
+
+def pcm_to_float(chunk: bytes) -> np.ndarray:
+    return np.frombuffer(chunk, dtype="<i2").astype(np.float32) / 32768.0
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import heapq
+from typing import Sequence
+
+import numpy as np
+
+WINDOW_SECONDS = (15.0, 30.0, 45.0, 60.0)
+STRIDE_SECONDS = 5.0
+
+
+def generate_windows(
+    duration: float,
+    window_seconds: Sequence[float] = WINDOW_SECONDS,
+    stride: float = STRIDE_SECONDS,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Multi-scale sliding windows over ``[0, duration]`` as parallel start/end arrays."""
+    if duration <= 0:
+        return np.zeros(0), np.zeros(0)
+    starts: list[np.ndarray] = []
+    ends: list[np.ndarray] = []
+    for length in window_seconds:
+        if length > duration:
+            continue
+        window_starts = np.arange(0.0, duration - length + 1e-9, stride)
+        starts.append(window_starts)
+        ends.append(window_starts + length)
+    if not starts:
+        return np.array([0.0]), np.array([duration])
+    return np.concatenate(starts), np.concatenate(ends)
+
+
+def window_means(values: np.ndarray, step: float, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Mean of a regularly sampled signal inside each window, via one cumulative sum."""
+    if len(values) == 0:
+        return np.zeros(len(starts))
+    cumulative = np.concatenate([[0.0], np.cumsum(values, dtype=np.float64)])
+    lo = np.clip((starts / step).astype(np.int64), 0, len(values) - 1)
+    hi = np.clip((ends / step).astype(np.int64), lo + 1, len(values))
+    return (cumulative[hi] - cumulative[lo]) / (hi - lo)
+
+
+def window_sums(per_item: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Sum of ``per_item[lo:hi]`` for every window, via one cumulative sum."""
+    cumulative = np.concatenate([[0.0], np.cumsum(per_item, dtype=np.float64)])
+    return cumulative[hi] - cumulative[lo]
+
+
+def select_non_overlapping(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    scores: np.ndarray,
+    limit: int,
+    max_overlap: float = 0.3,
+) -> list[int]:
+    """Greedy non-maximum suppression popping candidates from a max-heap.
+
+    Overlap is measured against the shorter of the two windows, so a window nested inside
+    an already selected one counts as a duplicate even though its IoU is small.
+    """
+    heap = [(-float(score), int(index)) for index, score in enumerate(scores)]
+    heapq.heapify(heap)
+    selected: list[int] = []
+    while heap and len(selected) < limit:
+        _, index = heapq.heappop(heap)
+        if selected:
+            chosen = np.asarray(selected)
+            intersection = np.clip(
+                np.minimum(ends[chosen], ends[index]) - np.maximum(starts[chosen], starts[index]), 0.0, None
+            )
+            shorter = np.minimum(ends[chosen] - starts[chosen], ends[index] - starts[index])
+            if np.max(intersection / np.maximum(shorter, 1e-9)) > max_overlap:
+                continue
+        selected.append(index)
+    return selected
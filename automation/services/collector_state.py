@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from ..config import get_settings
+from ..utils.files import write_text_atomic
+from ..utils.logging import get_logger
+
+logger = get_logger("collector_state")
+
+STATE_VERSION = 1
+MAX_OBSERVATIONS = 48
+
+
+class CollectorState:
+    """Per-video view history and per-niche search times, persisted between collections.
+
+    ``videos`` maps ``platform:id`` to the niche, publish time, first-seen time and
+    ``[timestamp, views]`` observations; it doubles as the set of tracked IDs used for dedup and
+    delta polling. ``searches`` maps a niche to when it was last searched.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or get_settings().data_root / "collector_state.json"
+        self.videos: dict[str, dict[str, Any]] = {}
+        self.searches: dict[str, float] = {}
+        self.load()
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable collector state %s: %s", self.path, exc)
+            return
+        if payload.get("version") != STATE_VERSION:
+            return
+        self.videos = payload.get("videos", {})
+        self.searches = payload.get("searches", {})
+
+    def save(self) -> None:
+        payload = {"version": STATE_VERSION, "videos": self.videos, "searches": self.searches}
+        write_text_atomic(self.path, json.dumps(payload))
+
+    def reset(self) -> None:
+        self.videos = {}
+        self.searches = {}
+
+    def search_due(self, niche: str, interval_seconds: float, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        return now - self.searches.get(niche, 0.0) >= interval_seconds
+
+    def mark_searched(self, niche: str, at: float | None = None) -> None:
+        self.searches[niche] = time.time() if at is None else at
+
+    def is_tracked(self, platform: str, video_id: str) -> bool:
+        return f"{platform}:{video_id}" in self.videos
+
+    def observe(
+        self,
+        platform: str,
+        video_id: str,
+        views: float | None,
+        niche: str | None = None,
+        published_at: str | None = None,
+        at: float | None = None,
+    ) -> dict[str, float | None]:
+        """Record a view count; returns the delta and views/hour since the previous observation."""
+        at = time.time() if at is None else at
+        entry = self.videos.setdefault(
+            f"{platform}:{video_id}",
+            {"niche": niche, "published_at": published_at, "first_seen": at, "observations": []},
+        )
+        observations = entry["observations"]
+        previous = observations[-1] if observations else None
+        if views is not None:
+            observations.append([at, float(views)])
+            del observations[:-MAX_OBSERVATIONS]
+        if previous is None or views is None:
+            return {"view_delta": None, "view_velocity": None}
+        delta = float(views) - previous[1]
+        hours = (at - previous[0]) / 3600
+        return {"view_delta": delta, "view_velocity": delta / hours if hours > 0 else None}
+
+    def refresh_due(self, platform: str, min_age_seconds: float, now: float | None = None) -> list[str]:
+        """Tracked video IDs whose latest observation is older than ``min_age_seconds``."""
+        now = time.time() if now is None else now
+        prefix = f"{platform}:"
+        return [
+            key[len(prefix) :]
+            for key, entry in self.videos.items()
+            if key.startswith(prefix)
+            and (not entry["observations"] or now - entry["observations"][-1][0] >= min_age_seconds)
+        ]
+
+    def niche_of(self, platform: str, video_id: str) -> str | None:
+        return self.videos.get(f"{platform}:{video_id}", {}).get("niche")
+
+    def prune(self, max_age_seconds: float, now: float | None = None) -> int:
+        """Stop tracking videos published (or, if unknown, first seen) more than ``max_age_seconds`` ago.
+
+        Age is not measured from the latest observation: every refresh re-observes tracked videos,
+        so that would keep them forever.
+        """
+        now = time.time() if now is None else now
+        stale = [key for key, entry in self.videos.items() if now - _tracked_since(entry) > max_age_seconds]
+        for key in stale:
+            del self.videos[key]
+        return len(stale)
+
+
+def _tracked_since(entry: dict[str, Any]) -> float:
+    published_at = entry.get("published_at")
+    if published_at:
+        try:
+            published = datetime.strptime(published_at[:19], "%Y-%m-%dT%H:%M:%S")
+            return published.replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            pass
+    if entry.get("first_seen") is not None:
+        return entry["first_seen"]
+    observations = entry["observations"]
+    return observations[0][0] if observations else 0.0
@@ -5,17 +5,19 @@ import json
 import math
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Iterable, Sequence
-
-import aiohttp
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from typing import TYPE_CHECKING, Iterable, Sequence
 
 from ..config import get_settings
 from ..data_models import Platform, SourceVideo
-from ..utils.logging import setup_logger
+from ..utils.logging import get_logger
+from .collector_state import CollectorState
+
+logger = get_logger("collectors")
+
+YOUTUBE_IDS_PER_REQUEST = 50
 
-logger = setup_logger("collectors")
+if TYPE_CHECKING:
+    import aiohttp
 
 
 class TrendingCollector:
@@ -23,17 +25,40 @@ class TrendingCollector:
 
     def __init__(self) -> None:
         self.settings = get_settings()
+        self.state = CollectorState()
 
     def fetch_youtube_trending(self, niches: Sequence[str]) -> list[SourceVideo]:
+        """Search niches that are due for unseen videos, then refresh tracked videos in bulk.
+
+        ``search.list`` costs 100 quota units per call while ``videos.list`` costs one per 50 IDs,
+        so each niche is searched at most every ``collector_search_minutes``; collections in between
+        only re-poll tracked videos by ID. Search keeps the fixed lookback: with
+        ``order="viewCount"`` a publish-time watermark would hide older videos that only start
+        trending later. Tracked videos are re-surfaced only while their views per hour clear
+        ``collector_resurface_views_per_hour``.
+        """
         api_key = self.settings.youtube_api_key
         if not api_key:
             logger.warning("YOUTUBE_API_KEY missing; skipping YouTube trending scan")
             return []
-        service = build("youtube", "v3", developerKey=api_key)
-        results: list[SourceVideo] = []
-        published_after = (datetime.utcnow() - timedelta(days=7)).isoformat("T") + "Z"
+        from googleapiclient.discovery import build
+        from googleapiclient.errors import HttpError
+
+        client_options = None
+        if self.settings.youtube_api_endpoint:
+            client_options = {"api_endpoint": self.settings.youtube_api_endpoint}
+        service = build("youtube", "v3", developerKey=api_key, client_options=client_options)
+        state = self.state
+        results: dict[str, SourceVideo] = {}
+        lookback = datetime.utcnow() - timedelta(days=self.settings.collector_track_days)
+        published_after = lookback.strftime("%Y-%m-%dT%H:%M:%SZ")
 
+        search_interval = self.settings.collector_search_minutes * 60
+        searched = 0
         for niche in niches:
+            if not state.search_due(niche, search_interval):
+                continue
+            searched += 1
             try:
                 search_response = (
                     service.search()
@@ -50,46 +75,90 @@ class TrendingCollector:
             except HttpError as exc:
                 logger.error("YouTube search error for niche %s: %s", niche, exc)
                 continue
+            state.mark_searched(niche)
 
             video_ids = [item["id"]["videoId"] for item in search_response.get("items", [])]
-            if not video_ids:
-                continue
+            new_ids = [
+                video_id
+                for video_id in video_ids
+                if video_id not in results and not state.is_tracked(Platform.YOUTUBE.value, video_id)
+            ]
+            for source in self._fetch_youtube_videos(service, new_ids, niche):
+                results[source.id] = source
 
-            try:
-                video_response = (
-                    service.videos()
-                    .list(
-                        part="snippet,statistics,contentDetails",
-                        id=",".join(video_ids),
-                    )
-                    .execute()
+        refresh_ids = [
+            video_id
+            for video_id in state.refresh_due(Platform.YOUTUBE.value, self.settings.collector_refresh_minutes * 60)
+            if video_id not in results
+        ]
+        refreshed = 0
+        for offset in range(0, len(refresh_ids), YOUTUBE_IDS_PER_REQUEST):
+            batch = refresh_ids[offset : offset + YOUTUBE_IDS_PER_REQUEST]
+            for source in self._fetch_youtube_videos(service, batch):
+                if self._still_trending(source.metrics):
+                    results[source.id] = source
+                    refreshed += 1
+        logger.info(
+            "YouTube: searched %d of %d niches, %d new videos, %d of %d tracked videos still trending",
+            searched,
+            len(niches),
+            len(results) - refreshed,
+            refreshed,
+            len(refresh_ids),
+        )
+        return list(results.values())
+
+    def _fetch_youtube_videos(self, service, video_ids: list[str], niche: str | None = None) -> list[SourceVideo]:
+        from googleapiclient.errors import HttpError
+
+        if not video_ids:
+            return []
+        try:
+            video_response = (
+                service.videos()
+                .list(
+                    part="snippet,statistics,contentDetails",
+                    id=",".join(video_ids),
                 )
-            except HttpError as exc:
-                logger.error("YouTube videos batch error: %s", exc)
-                continue
+                .execute()
+            )
+        except HttpError as exc:
+            logger.error("YouTube videos batch error: %s", exc)
+            return []
 
-            for item in video_response.get("items", []):
-                snippet = item["snippet"]
-                stats = item.get("statistics", {})
-                duration = self._parse_iso_duration(item["contentDetails"]["duration"])
-                results.append(
-                    SourceVideo(
-                        id=item["id"],
-                        platform=Platform.YOUTUBE,
-                        url=f"https://www.youtube.com/watch?v={item['id']}",
-                        title=snippet["title"],
-                        channel_or_author=snippet["channelTitle"],
-                        language=snippet.get("defaultAudioLanguage"),
-                        thumbnail_url=snippet["thumbnails"]["high"]["url"],
-                        duration_seconds=duration,
-                        metrics=self._build_metrics(stats),
-                    )
+        videos: list[SourceVideo] = []
+        for item in video_response.get("items", []):
+            snippet = item["snippet"]
+            stats = item.get("statistics", {})
+            published_at = snippet.get("publishedAt")
+            item_niche = niche or self.state.niche_of(Platform.YOUTUBE.value, item["id"])
+            metrics = self._build_metrics(stats)
+            metrics.update(
+                self._observe(Platform.YOUTUBE, item["id"], metrics["view_count"], item_niche, published_at)
+            )
+            duration = self._parse_iso_duration(item["contentDetails"]["duration"])
+            videos.append(
+                SourceVideo(
+                    id=item["id"],
+                    platform=Platform.YOUTUBE,
+                    url=f"https://www.youtube.com/watch?v={item['id']}",
+                    title=snippet["title"],
+                    channel_or_author=snippet["channelTitle"],
+                    language=snippet.get("defaultAudioLanguage"),
+                    thumbnail_url=snippet["thumbnails"]["high"]["url"],
+                    duration_seconds=duration,
+                    category_id=snippet.get("categoryId"),
+                    has_captions=item["contentDetails"].get("caption") == "true",
+                    metrics=metrics,
                 )
-        return results
+            )
+        return videos
 
     async def fetch_tiktok_trending(self, niches: Sequence[str]) -> list[SourceVideo]:
         # TikTok does not expose an official public API; we proxy via a popular-trends endpoint.
         # For production use, integrate a third-party provider or official Marketing API.
+        import aiohttp
+
         async with aiohttp.ClientSession() as session:
             tasks = [self._fetch_tiktok_niche(session, niche) for niche in niches]
             results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -104,7 +173,7 @@ class TrendingCollector:
     async def _fetch_tiktok_niche(
         self, session: aiohttp.ClientSession, niche: str
     ) -> list[SourceVideo]:
-        url = "https://www.tikwm.com/api/feed/search"
+        url = self.settings.tiktok_api_url
         payload = {"keywords": niche, "count": 10}
         async with session.post(url, data=payload, timeout=15) as response:
             if response.status != 200:
@@ -119,6 +188,8 @@ class TrendingCollector:
                 "comment_count": item.get("comment_count"),
                 "play_count": item.get("play_count"),
             }
+            if not self._record_niche_item(Platform.TIKTOK, item["video_id"], metrics, "play_count", niche, item):
+                continue
             videos.append(
                 SourceVideo(
                     id=item["video_id"],
@@ -136,6 +207,8 @@ class TrendingCollector:
 
     async def fetch_instagram_trending(self, niches: Sequence[str]) -> list[SourceVideo]:
         # Instagram does not provide an open API for reels; we rely on a third-party endpoint.
+        import aiohttp
+
         async with aiohttp.ClientSession() as session:
             tasks = [self._fetch_instagram_niche(session, niche) for niche in niches]
             results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -150,7 +223,7 @@ class TrendingCollector:
     async def _fetch_instagram_niche(
         self, session: aiohttp.ClientSession, niche: str
     ) -> list[SourceVideo]:
-        url = "https://www.instaviews.io/api/trending"
+        url = self.settings.instagram_api_url
         payload = {"tag": niche, "limit": 10}
         async with session.get(url, params=payload, timeout=15) as response:
             if response.status != 200:
@@ -163,6 +236,8 @@ class TrendingCollector:
                 "plays": item.get("plays"),
                 "comments": item.get("comments"),
             }
+            if not self._record_niche_item(Platform.INSTAGRAM, item["id"], metrics, "plays", niche, item):
+                continue
             videos.append(
                 SourceVideo(
                     id=item["id"],
@@ -178,6 +253,41 @@ class TrendingCollector:
             )
         return videos
 
+    def _record_niche_item(
+        self, platform: Platform, video_id: str, metrics: dict, views_key: str, niche: str, item: dict
+    ) -> bool:
+        """Adds view delta/velocity to ``metrics``; False for tracked items that are no longer trending.
+
+        These feeds take no publish-time cursor, so unchanged items are filtered client-side.
+        """
+        tracked = self.state.is_tracked(platform.value, video_id)
+        created = item.get("create_time") or item.get("taken_at")
+        published_at = None
+        if isinstance(created, (int, float)):
+            published_at = datetime.utcfromtimestamp(created).strftime("%Y-%m-%dT%H:%M:%SZ")
+        metrics.update(self._observe(platform, video_id, metrics.get(views_key), niche, published_at))
+        return not tracked or self._still_trending(metrics)
+
+    def _still_trending(self, metrics: dict) -> bool:
+        # Views almost always grow a little; only a real rate of growth brings a tracked video back.
+        return (metrics.get("view_velocity") or 0) >= self.settings.collector_resurface_views_per_hour
+
+    def _observe(
+        self, platform: Platform, video_id: str, views: float | None, niche: str | None, published_at: str | None
+    ) -> dict[str, float | None]:
+        observed = self.state.observe(platform.value, video_id, views, niche=niche, published_at=published_at)
+        if observed["view_velocity"] is None and views is not None and published_at:
+            # First sighting: average views per hour since publication.
+            published = datetime.strptime(published_at[:19], "%Y-%m-%dT%H:%M:%S")
+            hours = (datetime.utcnow() - published).total_seconds() / 3600
+            observed["view_velocity"] = float(views) / hours if hours > 0 else None
+        return observed
+
+    def save_state(self) -> Path:
+        self.state.prune(self.settings.collector_track_days * 86400)
+        self.state.save()
+        return self.state.path
+
     def persist_sources(self, sources: Iterable[SourceVideo]) -> Path:
         settings = self.settings
         path = settings.data_root / "sources.json"
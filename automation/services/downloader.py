@@ -1,16 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-import subprocess
 from pathlib import Path
+from typing import AsyncIterator
 
 import yt_dlp
 
 from ..config import get_settings
 from ..data_models import SourceVideo
-from ..utils.logging import setup_logger
+from ..utils.logging import get_logger
 
-logger = setup_logger("downloader")
+logger = get_logger("downloader")
 
 
 class VideoDownloader:
@@ -48,6 +48,8 @@ class VideoDownloader:
         audio_path = audio_dir / f"{video.id}.wav"
         args = [
             self.settings.ffmpeg_binary,
+            "-nostdin",
+            "-y",
             "-i",
             str(video.downloaded_path),
             "-ac",
@@ -61,3 +63,40 @@ class VideoDownloader:
         if process.returncode != 0:
             raise RuntimeError(f"ffmpeg failed for {video.id}")
         return audio_path
+
+    async def stream_audio(self, video: SourceVideo, chunk_bytes: int = 1 << 16) -> AsyncIterator[bytes]:
+        """Yield 16 kHz mono s16le PCM from an ffmpeg pipe without writing an intermediate file."""
+        if not video.downloaded_path:
+            raise ValueError("Video must be downloaded before extracting audio")
+        args = [
+            self.settings.ffmpeg_binary,
+            "-nostdin",
+            "-loglevel",
+            "error",
+            "-i",
+            str(video.downloaded_path),
+            "-vn",
+            "-ac",
+            "1",
+            "-ar",
+            "16000",
+            "-f",
+            "s16le",
+            "pipe:1",
+        ]
+        process = await asyncio.create_subprocess_exec(*args, stdout=asyncio.subprocess.PIPE)
+        carry = b""
+        try:
+            while chunk := await process.stdout.read(chunk_bytes):
+                chunk = carry + chunk
+                # Keep chunks sample-aligned; a pipe read can split a 2-byte sample.
+                aligned = len(chunk) - len(chunk) % 2
+                carry = chunk[aligned:]
+                if aligned:
+                    yield chunk[:aligned]
+        finally:
+            if process.returncode is None and not process.stdout.at_eof():
+                process.kill()
+            await process.wait()
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed for {video.id}")
@@ -1,24 +1,38 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
-from moviepy.editor import AudioFileClip, CompositeAudioClip, CompositeVideoClip, TextClip, VideoFileClip
-from moviepy.video.fx import all as vfx
+import numpy as np
+from moviepy.editor import CompositeAudioClip, CompositeVideoClip, VideoFileClip
 
 from ..config import get_settings
 from ..data_models import RenderedShort, SourceVideo, ViralSegment
-from ..utils.logging import setup_logger
+from ..utils.logging import get_logger
+from ..utils.metrics import get_metrics
 from .metadata import MetadataGenerator
+from .music import MusicLibrary
+from .overlays import OverlayCache, TextStyle
+from .reframer import CropTrack, SmartReframer
 
-logger = setup_logger("editor")
+logger = get_logger("editor")
+
+SUBTITLE_STYLE = TextStyle(fontsize=72, color="white", stroke_color="black", stroke_width=4)
+TARGET_SIZE = (1080, 1920)
+ZOOM_RATE = 0.02
 
 
 class ShortRenderer:
     def __init__(self) -> None:
         self.settings = get_settings()
         self.metadata_generator = MetadataGenerator()
+        self.overlays = OverlayCache()
+        self.reframer = SmartReframer()
+        self.music = MusicLibrary()
+        self.metrics = get_metrics()
 
-    def render(self, video: SourceVideo, segment: ViralSegment) -> RenderedShort:
+    def render(self, video: SourceVideo, segment: ViralSegment, parallel_renders: int = 1) -> RenderedShort:
+        """Render one short; ``parallel_renders`` is how many renders share the CPU with this one."""
         settings = self.settings
         if not video.downloaded_path:
             raise ValueError("Video must be downloaded before rendering")
@@ -26,24 +40,47 @@ class ShortRenderer:
         output_dir.mkdir(parents=True, exist_ok=True)
         output_path = output_dir / f"{video.id}_{int(segment.start_time)}.mp4"
 
+        with self.metrics.span("render", video.id) as span:
+            self._encode(video, segment, output_path, parallel_renders)
+            span.items = 1
+        with self.metrics.span("metadata", video.id) as span:
+            title, description, hashtags = self.metadata_generator.generate(segment, video)
+            span.items = 1
+        rendered = RenderedShort(
+            segment=segment,
+            output_path=output_path,
+            title=title,
+            description=description,
+            hashtags=hashtags,
+        )
+        logger.info("Rendered short to %s", output_path)
+        return rendered
+
+    def _encode(self, video: SourceVideo, segment: ViralSegment, output_path: Path, parallel_renders: int) -> None:
+        settings = self.settings
+        track = self.reframer.track_for(video) if settings.smart_reframe else CropTrack.centered()
         clip = VideoFileClip(str(video.downloaded_path)).subclip(segment.start_time, segment.end_time)
-        vertical_clip = self._convert_to_vertical(clip)
-        vertical_clip = self._apply_zoom(vertical_clip)
+        vertical_clip = self._convert_to_vertical(clip, track, segment.start_time)
         vertical_clip = self._apply_subtitles(vertical_clip, segment.transcript_snippet)
         vertical_clip = self._apply_branding(vertical_clip)
 
         audio = vertical_clip.audio
-        background_music = self._load_background_music(segment)
+        background_music = self.music.bed_for(segment)
         if background_music:
             audio = CompositeAudioClip([audio.volumex(1.0), background_music.volumex(0.15)])
         final_clip = vertical_clip.set_audio(audio)
+        profile = settings.active_render_profile
+        ffmpeg_params = ["-crf", str(profile.crf)]
+        if profile.tune:
+            ffmpeg_params += ["-tune", profile.tune]
         final_clip.write_videofile(
             str(output_path),
             codec="libx264",
             audio_codec="aac",
-            fps=30,
-            preset="medium",
-            threads=4,
+            fps=profile.fps,
+            preset=profile.preset,
+            threads=self._encoder_threads(parallel_renders),
+            ffmpeg_params=ffmpeg_params,
             verbose=False,
             logger=None,
         )
@@ -52,32 +89,31 @@ class ShortRenderer:
             background_music.close()
         final_clip.close()
 
-        title, description, hashtags = self.metadata_generator.generate(segment, video)
-        rendered = RenderedShort(
-            segment=segment,
-            output_path=output_path,
-            title=title,
-            description=description,
-            hashtags=hashtags,
-        )
-        logger.info("Rendered short to %s", output_path)
-        return rendered
+    def _encoder_threads(self, parallel_renders: int) -> int:
+        profile = self.settings.active_render_profile
+        if profile.threads:
+            return profile.threads
+        return max(1, (os.cpu_count() or 1) // max(1, parallel_renders))
 
-    def _convert_to_vertical(self, clip: VideoFileClip) -> VideoFileClip:
+    def _convert_to_vertical(self, clip: VideoFileClip, track: CropTrack, offset: float) -> VideoFileClip:
+        # Crop at source resolution along the crop track (shrinking the window for the slow
+        # zoom), then resample once to the fixed output size.
         width, height = clip.size
-        target_width = 1080
-        target_height = 1920
-        factor = max(target_height / height, target_width / width)
-        clip = clip.resize(factor).crop(
-            x_center=clip.w / 2,
-            width=target_width,
-            y_center=clip.h / 2,
-            height=target_height,
-        )
-        return clip
+        target_width, target_height = TARGET_SIZE
+        crop_width = min(width, round(height * target_width / target_height))
+        crop_height = min(height, round(width * target_height / target_width))
 
-    def _apply_zoom(self, clip: VideoFileClip) -> VideoFileClip:
-        return clip.fx(vfx.resize, lambda t: 1 + 0.02 * t)
+        def crop_frame(get_frame, t):
+            frame = get_frame(t)
+            zoom = 1 + ZOOM_RATE * t
+            window_width = max(2, int(crop_width / zoom))
+            window_height = max(2, int(crop_height / zoom))
+            center_x = track.center_at(offset + t) * width
+            x0 = int(np.clip(center_x - window_width / 2, 0, width - window_width))
+            y0 = (height - window_height) // 2
+            return frame[y0 : y0 + window_height, x0 : x0 + window_width]
+
+        return clip.fl(crop_frame).resize(newsize=TARGET_SIZE)
 
     def _apply_subtitles(self, clip: VideoFileClip, transcript: str) -> VideoFileClip:
         words = transcript.split()
@@ -88,14 +124,7 @@ class ShortRenderer:
             start = index * 0.6
             duration = 1.6
             txt_clip = (
-                TextClip(
-                    chunk,
-                    fontsize=72,
-                    font="Arial-Bold",
-                    color="white",
-                    stroke_color="black",
-                    stroke_width=4,
-                )
+                self.overlays.text(chunk, SUBTITLE_STYLE)
                 .set_start(start)
                 .set_duration(duration)
                 .set_pos(("center", 1400))
@@ -109,32 +138,16 @@ class ShortRenderer:
         settings = self.settings
         watermark_path = settings.watermark_path
         overlays = [clip]
-        if watermark_path and Path(watermark_path).exists():
-            logo = (
-                VideoFileClip(str(watermark_path))
-                .resize(height=120)
-                .set_duration(clip.duration)
-                .set_pos(("right", "top"))
-                .set_opacity(0.6)
-            )
+        logo = self.overlays.watermark(watermark_path, height=120) if watermark_path else None
+        if logo is not None:
+            logo = logo.set_duration(clip.duration).set_pos(("right", "top")).set_opacity(0.6)
             overlays.append(logo)
         cta = (
-            TextClip(
-                "Subscribe for more",
-                fontsize=64,
-                font="Arial-Bold",
-                color=settings.brand_primary_hex,
+            self.overlays.text(
+                "Subscribe for more", TextStyle(fontsize=64, color=settings.brand_primary_hex), memoize=True
             )
             .set_duration(clip.duration)
             .set_pos(("center", 1800))
         )
         overlays.append(cta)
         return CompositeVideoClip(overlays)
-
-    def _load_background_music(self, segment: ViralSegment) -> AudioFileClip | None:
-        music_dir = self.settings.data_root / "music"
-        options = list(music_dir.glob("*.mp3"))
-        if not options:
-            return None
-        target = options[hash(segment.source_video_id) % len(options)]
-        return AudioFileClip(str(target))
@@ -7,9 +7,9 @@ import openai
 
 from ..config import get_settings
 from ..data_models import SourceVideo, ViralSegment
-from ..utils.logging import setup_logger
+from ..utils.logging import get_logger
 
-logger = setup_logger("metadata")
+logger = get_logger("metadata")
 
 
 class MetadataGenerator:
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+from moviepy.audio.AudioClip import AudioArrayClip
+
+from ..config import get_settings
+from ..data_models import ViralSegment
+from ..utils.files import KeyedLocks, atomic_write, write_text_atomic
+from ..utils.logging import get_logger
+
+logger = get_logger("music")
+
+INDEX_VERSION = 1
+AUDIO_EXTENSIONS = (".mp3", ".m4a", ".wav", ".ogg", ".flac")
+ANALYSIS_SAMPLE_RATE = 22050
+ANALYSIS_SECONDS = 120.0
+BED_SAMPLE_RATE = 44100
+BED_LENGTHS = (15, 30, 45, 60)
+TARGET_RMS_DBFS = -20.0
+FADE_OUT_SECONDS = 1.0
+
+
+@dataclass
+class MusicTrack:
+    name: str
+    fingerprint: str
+    duration: float
+    loudness_dbfs: float
+    bpm: float
+    moods: list[str] = field(default_factory=list)
+
+
+def mood_tags(bpm: float, loudness_dbfs: float) -> list[str]:
+    if bpm >= 120:
+        tags = ["energetic"]
+    elif bpm >= 90:
+        tags = ["upbeat"]
+    else:
+        tags = ["calm"]
+    if loudness_dbfs >= -14:
+        tags.append("intense")
+    elif loudness_dbfs <= -26:
+        tags.append("ambient")
+    return tags
+
+
+def rms_dbfs(samples: np.ndarray) -> float:
+    rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64)))) if samples.size else 0.0
+    return 20 * np.log10(max(rms, 1e-9))
+
+
+class MusicLibrary:
+    """Indexed background music with deterministic selection and cached, loudness-normalized beds.
+
+    The index (``music/index.json``) is rebuilt incrementally when tracks are added, changed or
+    removed; beds trimmed to the common short lengths are decoded once and kept as ``.npy``.
+    """
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self.music_dir = self.settings.data_root / "music"
+        self.index_path = self.music_dir / "index.json"
+        self.cache_dir = self.settings.data_root / "cache" / "music"
+        self._tracks: list[MusicTrack] | None = None
+        self._lock = threading.Lock()
+        self._bed_locks = KeyedLocks()
+
+    @property
+    def tracks(self) -> list[MusicTrack]:
+        with self._lock:
+            if self._tracks is None:
+                self._tracks = self.refresh()
+            return self._tracks
+
+    def refresh(self) -> list[MusicTrack]:
+        indexed = {track.name: track for track in self._load_index()}
+        files = sorted(path for path in self.music_dir.glob("*") if path.suffix.lower() in AUDIO_EXTENSIONS)
+        tracks: list[MusicTrack] = []
+        changed = len(indexed) != len(files)
+        for path in files:
+            fingerprint = self._fingerprint(path)
+            track = indexed.get(path.name)
+            if track is None or track.fingerprint != fingerprint:
+                try:
+                    track = self._analyze(path, fingerprint)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Skipping unreadable music track %s: %s", path.name, exc)
+                    changed = True
+                    continue
+                changed = True
+            tracks.append(track)
+        if changed:
+            self._save_index(tracks)
+            logger.info("Indexed %d music tracks", len(tracks))
+        return tracks
+
+    def select(self, segment: ViralSegment) -> MusicTrack | None:
+        tracks = self.tracks
+        if not tracks:
+            return None
+        seconds = segment.end_time - segment.start_time
+        wanted = "energetic" if segment.energy_score >= 0.6 else "calm"
+        candidates = [track for track in tracks if wanted in track.moods and track.duration >= seconds]
+        candidates = candidates or [track for track in tracks if track.duration >= seconds] or tracks
+        # sha1 rather than hash(): str hashes are salted per process, which made renders irreproducible.
+        digest = hashlib.sha1(segment.source_video_id.encode("utf-8")).hexdigest()
+        return candidates[int(digest, 16) % len(candidates)]
+
+    def bed_for(self, segment: ViralSegment) -> AudioArrayClip | None:
+        track = self.select(segment)
+        if track is None:
+            return None
+        seconds = segment.end_time - segment.start_time
+        samples = self._bed_samples(track, seconds)
+        return AudioArrayClip(samples, fps=BED_SAMPLE_RATE).set_duration(min(seconds, len(samples) / BED_SAMPLE_RATE))
+
+    def _bed_samples(self, track: MusicTrack, seconds: float) -> np.ndarray:
+        length = next((bucket for bucket in BED_LENGTHS if bucket >= seconds), int(np.ceil(seconds)))
+        cache_path = self.cache_dir / f"{track.fingerprint}_{length}s.npy"
+        # Segments of one source usually share a track and length bucket; decode each bed once.
+        with self._bed_locks(cache_path):
+            if cache_path.exists():
+                return np.load(cache_path)
+            samples = self._decode_bed(track, length)
+            with atomic_write(cache_path) as tmp_path:
+                np.save(tmp_path, samples)
+        return samples
+
+    def _decode_bed(self, track: MusicTrack, length: int) -> np.ndarray:
+        import librosa
+
+        audio, _ = librosa.load(
+            self.music_dir / track.name, sr=BED_SAMPLE_RATE, mono=False, duration=min(length, track.duration)
+        )
+        audio = np.atleast_2d(audio)
+        if audio.shape[0] == 1:
+            audio = np.repeat(audio, 2, axis=0)
+        frames = length * BED_SAMPLE_RATE
+        if audio.shape[1] < frames:
+            audio = np.tile(audio, (1, int(np.ceil(frames / audio.shape[1]))))
+        samples = audio[:2, :frames].T.astype(np.float32)
+        samples *= 10 ** ((TARGET_RMS_DBFS - rms_dbfs(samples)) / 20)
+        fade = min(len(samples), int(FADE_OUT_SECONDS * BED_SAMPLE_RATE))
+        samples[len(samples) - fade :] *= np.linspace(1.0, 0.0, fade, dtype=np.float32)[:, None]
+        np.clip(samples, -1.0, 1.0, out=samples)
+        return samples
+
+    def _analyze(self, path: Path, fingerprint: str) -> MusicTrack:
+        import librosa
+
+        duration = float(librosa.get_duration(path=str(path)))
+        audio, sr = librosa.load(path, sr=ANALYSIS_SAMPLE_RATE, mono=True, duration=ANALYSIS_SECONDS)
+        tempo, _ = librosa.beat.beat_track(y=audio, sr=sr)
+        bpm = float(np.atleast_1d(tempo)[0])
+        loudness = rms_dbfs(audio)
+        return MusicTrack(
+            name=path.name,
+            fingerprint=fingerprint,
+            duration=duration,
+            loudness_dbfs=round(loudness, 2),
+            bpm=round(bpm, 1),
+            moods=mood_tags(bpm, loudness),
+        )
+
+    def _load_index(self) -> list[MusicTrack]:
+        if not self.index_path.exists():
+            return []
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable music index %s: %s", self.index_path, exc)
+            return []
+        if payload.get("version") != INDEX_VERSION:
+            return []
+        return [MusicTrack(**track) for track in payload.get("tracks", [])]
+
+    def _save_index(self, tracks: list[MusicTrack]) -> None:
+        payload = {"version": INDEX_VERSION, "tracks": [asdict(track) for track in tracks]}
+        write_text_atomic(self.index_path, json.dumps(payload, indent=2))
+
+    @staticmethod
+    def _fingerprint(path: Path) -> str:
+        stat = path.stat()
+        key = f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import astuple, dataclass
+from pathlib import Path
+
+import numpy as np
+from moviepy.editor import ImageClip, TextClip, VideoFileClip
+
+from ..config import get_settings
+from ..utils.files import KeyedLocks, atomic_write
+from ..utils.logging import get_logger
+
+logger = get_logger("overlays")
+
+RASTER_VERSION = 2  # bump when the on-disk raster layout changes
+MEMORY_ENTRIES = 16
+
+
+@dataclass(frozen=True)
+class TextStyle:
+    fontsize: int
+    color: str = "white"
+    font: str = "Arial-Bold"
+    stroke_color: str | None = None
+    stroke_width: float = 1
+
+
+class OverlayCache:
+    """Rasterizes text and watermark overlays once and reuses them across renders.
+
+    Every raster is cached on disk; only overlays reused by every short (CTA, watermark) are
+    also kept in a small in-memory LRU, since subtitle chunks almost never repeat.
+    """
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self.cache_dir = self.settings.data_root / "cache" / "overlays"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._memory: OrderedDict[str, tuple[np.ndarray, np.ndarray]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._render_locks = KeyedLocks()
+
+    def text(self, text: str, style: TextStyle, memoize: bool = False) -> ImageClip:
+        key = self._key("text", text, *astuple(style))
+        rgb, alpha = self._load_or_render(key, lambda: self._rasterize_text(text, style), memoize)
+        return self._to_clip(rgb, alpha)
+
+    def watermark(self, path: Path, height: int) -> ImageClip | None:
+        path = Path(path)
+        if not path.exists():
+            return None
+        key = self._key("watermark", str(path.resolve()), path.stat().st_mtime_ns, height)
+        rgb, alpha = self._load_or_render(key, lambda: self._rasterize_watermark(path, height), memoize=True)
+        return self._to_clip(rgb, alpha)
+
+    def _load_or_render(self, key: str, render, memoize: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        cache_path = self.cache_dir / f"{key}.npz"
+        # Concurrent renders on a cold cache all want the CTA; rasterize it once and let the rest load it.
+        with self._render_locks(key):
+            if cache_path.exists():
+                with np.load(cache_path) as cached:
+                    raster = (cached["rgb"], cached["alpha"])
+            else:
+                raster = render()
+                with atomic_write(cache_path) as tmp_path:
+                    np.savez_compressed(tmp_path, rgb=raster[0], alpha=raster[1])
+                logger.debug("Cached overlay raster %s", cache_path.name)
+        if memoize:
+            with self._lock:
+                self._memory[key] = raster
+                while len(self._memory) > MEMORY_ENTRIES:
+                    self._memory.popitem(last=False)
+        return raster
+
+    @staticmethod
+    def _rasterize_text(text: str, style: TextStyle) -> tuple[np.ndarray, np.ndarray]:
+        clip = TextClip(
+            text,
+            fontsize=style.fontsize,
+            font=style.font,
+            color=style.color,
+            stroke_color=style.stroke_color,
+            stroke_width=style.stroke_width,
+        )
+        try:
+            rgb = clip.get_frame(0).astype(np.uint8)
+            alpha = _alpha_to_uint8(clip.mask.get_frame(0))
+        finally:
+            clip.close()
+        return rgb, alpha
+
+    @staticmethod
+    def _rasterize_watermark(path: Path, height: int) -> tuple[np.ndarray, np.ndarray]:
+        clip = VideoFileClip(str(path), audio=False, has_mask=True).resize(height=height)
+        try:
+            rgb = clip.get_frame(0).astype(np.uint8)
+            if clip.mask is not None:
+                alpha = _alpha_to_uint8(clip.mask.get_frame(0))
+            else:
+                alpha = np.full(rgb.shape[:2], 255, dtype=np.uint8)
+        finally:
+            clip.close()
+        return rgb, alpha
+
+    @staticmethod
+    def _to_clip(rgb: np.ndarray, alpha: np.ndarray) -> ImageClip:
+        mask = ImageClip(alpha.astype(np.float32) / 255.0, ismask=True)
+        return ImageClip(rgb).set_mask(mask)
+
+    @staticmethod
+    def _key(kind: str, *parts: object) -> str:
+        key = "\x1f".join(str(part) for part in (RASTER_VERSION, *parts))
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return f"{kind}_{digest[:20]}"
+
+
+def _alpha_to_uint8(mask: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(mask * 255), 0, 255).astype(np.uint8)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import re
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+import numpy as np
+
+from ..config import get_settings
+from ..data_models import SourceVideo
+from ..utils.files import file_lock, write_text_atomic
+from ..utils.logging import get_logger
+from ..utils.metrics import get_metrics
+
+logger = get_logger("prefilter")
+
+if TYPE_CHECKING:
+    import aiohttp
+
+YOUTUBE_MUSIC_CATEGORY = "10"
+MUSIC_TITLE_PATTERN = re.compile(
+    r"official (music )?video|official audio|lyric(s)? video|\(lyrics\)|full album|\binstrumental\b|\bplaylist\b",
+    re.IGNORECASE,
+)
+UNKNOWN_LANGUAGES = {"", "unknown", "und", "zxx"}
+THUMBNAIL_CONCURRENCY = 8
+THUMBNAIL_TIMEOUT_SECONDS = 10
+THUMBNAIL_SIZE = (32, 32)
+# Grey-level standard deviation below which a thumbnail is a blank or placeholder frame.
+THUMBNAIL_MIN_STD = 4.0
+USED_LEDGER_DAYS = 90
+
+
+class UsedSourceLedger:
+    """``used_sources.json``: every source id the pipeline has committed to processing.
+
+    Recorded when a source is processed in-process or enqueued for workers, whatever the
+    outcome, so sources that yielded no segments are not downloaded again. Missing ledgers
+    are backfilled once from the run archives.
+    """
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self.path = self.settings.data_root / "used_sources.json"
+        self.lock_path = self.path.with_suffix(".lock")
+
+    def ids(self) -> set[str]:
+        with file_lock(self.lock_path):
+            return set(self._read())
+
+    def add(self, ids: Iterable[str]) -> None:
+        now = time.time()
+        with file_lock(self.lock_path):
+            used = self._read()
+            used.update({source_id: now for source_id in ids})
+            cutoff = now - USED_LEDGER_DAYS * 86400
+            self._write({source_id: at for source_id, at in used.items() if at >= cutoff})
+
+    def _read(self) -> dict[str, float]:
+        if not self.path.exists():
+            used = self._backfill()
+            self._write(used)
+            return used
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Rebuilding unreadable used-source ledger %s: %s", self.path, exc)
+            return self._backfill()
+
+    def _backfill(self) -> dict[str, float]:
+        used: dict[str, float] = {}
+        for run_path in (self.settings.data_root / "runs").glob("run_*.json"):
+            try:
+                results = json.loads(run_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            at = run_path.stat().st_mtime
+            for result in results:
+                source_id = result.get("source", {}).get("id")
+                if source_id:
+                    used[source_id] = max(used.get(source_id, 0.0), at)
+        return used
+
+    def _write(self, used: dict[str, float]) -> None:
+        write_text_atomic(self.path, json.dumps(used))
+
+
+class SourcePrefilter:
+    """Rejects unusable sources from collected metadata before anything is downloaded.
+
+    Rules run cheapest first; each rejection is counted per rule in ``rejections`` and
+    exported as ``pipeline_prefilter_rejections_total{rule=...}``. Thumbnails are fetched in
+    rank order only until ``limit`` sources are accepted.
+    """
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self.metrics = get_metrics()
+        self.rejections: Counter[str] = Counter()
+        self.ledger = UsedSourceLedger()
+
+    def mark_used(self, sources: Iterable[SourceVideo]) -> None:
+        self.ledger.add(source.id for source in sources)
+
+    async def filter(self, sources: Sequence[SourceVideo], limit: int | None = None) -> list[SourceVideo]:
+        """Accepted sources in their original (rank) order, at most ``limit`` of them."""
+        used = self.ledger.ids()
+        candidates: list[SourceVideo] = []
+        for source in sources:
+            rule = self._metadata_rule(source, used)
+            if rule:
+                self._reject(source, rule)
+            else:
+                candidates.append(source)
+        if self.settings.prefilter_check_thumbnails and candidates:
+            accepted = await self._check_thumbnails(candidates, limit)
+        else:
+            accepted = candidates[:limit]
+        logger.info(
+            "Prefilter kept %d of %d sources (%s)",
+            len(accepted),
+            len(sources),
+            ", ".join(f"{rule}={count}" for rule, count in sorted(self.rejections.items())) or "no rejections",
+        )
+        return accepted
+
+    def _metadata_rule(self, source: SourceVideo, used: set[str]) -> str | None:
+        settings = self.settings
+        if source.id in used:
+            return "already_used"
+        language = (source.language or "").split("-")[0].lower()
+        if language in UNKNOWN_LANGUAGES:
+            if settings.prefilter_strict_language:
+                return "language"
+        elif language not in {preferred.lower() for preferred in settings.prefer_languages}:
+            return "language"
+        duration = source.duration_seconds
+        if duration is not None and not (
+            settings.prefilter_min_duration_seconds <= duration <= settings.prefilter_max_duration_seconds
+        ):
+            return "duration"
+        if source.category_id == YOUTUBE_MUSIC_CATEGORY or MUSIC_TITLE_PATTERN.search(source.title):
+            return "music_only"
+        if settings.prefilter_require_captions and source.has_captions is False:
+            return "captions"
+        return None
+
+    def _reject(self, source: SourceVideo, rule: str) -> None:
+        self.rejections[rule] += 1
+        self.metrics.increment("prefilter_rejections", "rule", rule)
+        logger.debug("Prefilter rejected %s: %s", source.id, rule)
+
+    async def _check_thumbnails(self, sources: Sequence[SourceVideo], limit: int | None) -> list[SourceVideo]:
+        import aiohttp
+
+        accepted: list[SourceVideo] = []
+        timeout = aiohttp.ClientTimeout(total=THUMBNAIL_TIMEOUT_SECONDS)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+
+            async def check(source: SourceVideo) -> bool:
+                if not source.thumbnail_url:
+                    return True
+                return await self._thumbnail_usable(session, _small_thumbnail(str(source.thumbnail_url)))
+
+            offset = 0
+            while offset < len(sources) and (limit is None or len(accepted) < limit):
+                # Fetch only as many thumbnails as could still be needed, a bounded batch at a time.
+                size = THUMBNAIL_CONCURRENCY if limit is None else min(THUMBNAIL_CONCURRENCY, limit - len(accepted))
+                batch = sources[offset : offset + size]
+                offset += size
+                for source, usable in zip(batch, await asyncio.gather(*(check(source) for source in batch))):
+                    if usable:
+                        accepted.append(source)
+                    else:
+                        self._reject(source, "thumbnail")
+        return accepted
+
+    @staticmethod
+    async def _thumbnail_usable(session: aiohttp.ClientSession, url: str) -> bool:
+        import aiohttp
+
+        try:
+            async with session.get(url) as response:
+                if response.status in (404, 410):
+                    return False  # removed or private upload
+                if response.status != 200:
+                    return True
+                data = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            logger.debug("Thumbnail fetch failed for %s: %s", url, exc)
+            return True  # do not reject on transient network errors
+        try:
+            from PIL import Image
+
+            with Image.open(io.BytesIO(data)) as image:
+                pixels = np.asarray(image.convert("L").resize(THUMBNAIL_SIZE), dtype=np.float32)
+        except Exception:  # noqa: BLE001
+            return True
+        return float(pixels.std()) >= THUMBNAIL_MIN_STD
+
+
+def _small_thumbnail(url: str) -> str:
+    # YouTube serves the same frame at 120x90 as default.jpg; a tenth of the bytes of hqdefault.
+    if "ytimg.com/vi/" in url:
+        return re.sub(r"/[a-z]*default\.jpg", "/default.jpg", url)
+    return url
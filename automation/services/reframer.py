@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from moviepy.editor import VideoFileClip
+
+from ..config import get_settings
+from ..data_models import SourceVideo
+from ..utils.files import KeyedLocks, atomic_write
+from ..utils.logging import get_logger
+
+logger = get_logger("reframer")
+
+ANALYSIS_HEIGHT = 144
+ANALYSIS_FPS = 2.0
+HISTOGRAM_BINS = 32
+SHOT_CUT_THRESHOLD = 0.5
+SMOOTHING_SECONDS = 2.0
+BATCH_FRAMES = 64
+
+
+@dataclass
+class CropTrack:
+    """Normalized horizontal crop centers sampled over the source timeline."""
+
+    times: np.ndarray
+    centers: np.ndarray
+    shot_starts: np.ndarray
+
+    @classmethod
+    def centered(cls) -> CropTrack:
+        return cls(times=np.array([0.0]), centers=np.array([0.5]), shot_starts=np.array([0.0]))
+
+    def center_at(self, t: float) -> float:
+        return float(np.interp(t, self.times, self.centers))
+
+
+class SmartReframer:
+    """Computes subject-following crop tracks once per source on downsampled frames."""
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self.cache_dir = self.settings.data_root / "cache" / "reframe"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._locks = KeyedLocks()
+
+    def track_for(self, video: SourceVideo) -> CropTrack:
+        if not video.downloaded_path:
+            raise ValueError("Video must be downloaded before reframing")
+        cache_path = self.cache_dir / f"{video.id}_{self._fingerprint(video.downloaded_path)}.npz"
+        # Segments of one source render concurrently; only the first decodes it, the rest wait for the cache.
+        with self._locks(cache_path):
+            if cache_path.exists():
+                with np.load(cache_path) as cached:
+                    return CropTrack(cached["times"], cached["centers"], cached["shot_starts"])
+            try:
+                track = self._analyze(video.downloaded_path)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Reframe analysis failed for %s, using center crop: %s", video.id, exc)
+                return CropTrack.centered()
+            with atomic_write(cache_path) as tmp_path:
+                np.savez(tmp_path, times=track.times, centers=track.centers, shot_starts=track.shot_starts)
+        logger.info("Computed crop track for %s with %d shots", video.id, len(track.shot_starts))
+        return track
+
+    def _analyze(self, path: Path) -> CropTrack:
+        clip = VideoFileClip(str(path), audio=False, target_resolution=(ANALYSIS_HEIGHT, None))
+        histograms: list[np.ndarray] = []
+        profiles: list[np.ndarray] = []
+        previous: np.ndarray | None = None
+        try:
+            batch: list[np.ndarray] = []
+            for frame in clip.iter_frames(fps=ANALYSIS_FPS, dtype="uint8"):
+                batch.append(frame)
+                if len(batch) == BATCH_FRAMES:
+                    previous = self._process_batch(batch, previous, histograms, profiles)
+                    batch = []
+            if batch:
+                self._process_batch(batch, previous, histograms, profiles)
+        finally:
+            clip.close()
+        if not profiles:
+            return CropTrack.centered()
+
+        hist = np.concatenate(histograms)
+        profile = np.concatenate(profiles)
+        times = np.arange(len(profile)) / ANALYSIS_FPS
+
+        hist_delta = np.abs(np.diff(hist, axis=0)).sum(axis=1) / 2
+        cuts = np.flatnonzero(hist_delta > SHOT_CUT_THRESHOLD) + 1
+        shot_bounds = np.concatenate([[0], cuts, [len(profile)]])
+
+        columns = (np.arange(profile.shape[1]) + 0.5) / profile.shape[1]
+        weight = profile.sum(axis=1)
+        raw_centers = np.where(weight > 1e-6, profile @ columns / np.maximum(weight, 1e-6), 0.5)
+        centers = self._smooth_within_shots(raw_centers, shot_bounds)
+
+        # Duplicate the last sample of each shot just before the cut so interpolation jumps at cuts.
+        cut_times = times[cuts] - 1e-3
+        all_times = np.concatenate([times, cut_times])
+        all_centers = np.concatenate([centers, centers[cuts - 1]])
+        order = np.argsort(all_times, kind="stable")
+        return CropTrack(times=all_times[order], centers=all_centers[order], shot_starts=times[shot_bounds[:-1]])
+
+    @staticmethod
+    def _process_batch(
+        batch: list[np.ndarray],
+        previous: np.ndarray | None,
+        histograms: list[np.ndarray],
+        profiles: list[np.ndarray],
+    ) -> np.ndarray:
+        frames = np.stack(batch).astype(np.float32)
+        gray = frames @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+        bins = np.minimum((gray * HISTOGRAM_BINS / 256).astype(np.int64), HISTOGRAM_BINS - 1)
+        offsets = np.arange(len(gray))[:, None, None] * HISTOGRAM_BINS
+        counts = np.bincount((bins + offsets).ravel(), minlength=len(gray) * HISTOGRAM_BINS)
+        histograms.append(counts.reshape(len(gray), HISTOGRAM_BINS) / bins[0].size)
+
+        # Saliency per column: motion against the previous sample plus local contrast.
+        prior = np.concatenate([gray[:1] if previous is None else previous[None], gray[:-1]])
+        motion = np.abs(gray - prior).mean(axis=1)
+        contrast = np.abs(gray - gray.mean(axis=(1, 2), keepdims=True)).mean(axis=1)
+        profiles.append(2.0 * motion + contrast)
+        return gray[-1]
+
+    @staticmethod
+    def _smooth_within_shots(values: np.ndarray, shot_bounds: np.ndarray) -> np.ndarray:
+        window = max(1, int(SMOOTHING_SECONDS * ANALYSIS_FPS))
+        smoothed = np.empty_like(values)
+        for start, end in zip(shot_bounds[:-1], shot_bounds[1:]):
+            shot = values[start:end]
+            cumulative = np.concatenate([[0.0], np.cumsum(shot)])
+            idx = np.arange(len(shot))
+            lo = np.maximum(idx - window, 0)
+            hi = np.minimum(idx + window + 1, len(shot))
+            smoothed[start:end] = (cumulative[hi] - cumulative[lo]) / (hi - lo)
+        return smoothed
+
+    @staticmethod
+    def _fingerprint(path: Path) -> str:
+        stat = Path(path).stat()
+        key = f"{Path(path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}:{ANALYSIS_HEIGHT}:{ANALYSIS_FPS}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
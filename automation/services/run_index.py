@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Sequence
+
+from ..config import get_settings
+from ..data_models import PipelineResult
+from ..utils.files import file_lock, write_text_atomic
+from ..utils.logging import get_logger
+
+logger = get_logger("run_index")
+
+INDEX_VERSION = 1
+MAX_INDEXED_RUNS = 50
+MAX_LATEST_SHORTS = 20
+
+
+def _write_atomic(path: Path, payload: dict[str, Any]) -> None:
+    write_text_atomic(path, json.dumps(payload, indent=2, default=str))
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def summarize_run(run_id: str, results: Sequence[PipelineResult]) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Dashboard summary of one archived run plus its shorts, newest first."""
+    spans = [span for result in results for span in result.stage_metrics]
+    stages: dict[str, dict[str, Any]] = defaultdict(lambda: {"count": 0, "errors": 0, "wallSeconds": 0.0})
+    for span in spans:
+        stage = stages[span["stage"]]
+        stage["count"] += 1
+        stage["errors"] += span.get("status") != "ok"
+        stage["wallSeconds"] += span.get("wall_seconds", 0.0)
+    for stage in stages.values():
+        stage["status"] = "error" if stage["errors"] else "ok"
+
+    completed = max((result.completed_at for result in results), default=datetime.utcnow())
+    completed_epoch = completed.replace(tzinfo=timezone.utc).timestamp()
+    started = min((span["started_at"] for span in spans), default=completed_epoch)
+    shorts = [short for result in results for short in result.rendered_shorts]
+    published = sum(short.upload_status == "uploaded" for short in shorts)
+    segments = sum(len(result.segments) for result in results)
+    run = {
+        "id": run_id,
+        "startedAt": datetime.utcfromtimestamp(started).isoformat() + "Z",
+        "completedAt": completed.isoformat() + "Z",
+        "durationSeconds": round(max(0.0, completed_epoch - started), 3),
+        "sourcesProcessed": len(results),
+        "segmentsDetected": segments,
+        "shortsRendered": len(shorts),
+        "shortsPublished": published,
+        "stages": dict(stages),
+        "summary": f"{len(results)} sources, {segments} segments, {published}/{len(shorts)} shorts published",
+    }
+    latest_shorts = [
+        {
+            "runId": run_id,
+            "sourceId": short.segment.source_video_id,
+            "title": short.title,
+            "outputPath": str(short.output_path),
+            "uploadStatus": short.upload_status,
+            "youtubeVideoId": short.youtube_video_id,
+            "scheduledTime": short.scheduled_time.isoformat() + "Z" if short.scheduled_time else None,
+        }
+        for short in reversed(shorts)
+    ]
+    return run, latest_shorts
+
+
+class RunIndex:
+    """Small ``runs/index.json`` summary kept next to the full run archives.
+
+    Readers (the dashboard, ``main --status``) load one bounded file instead of parsing every
+    ``run_*.json``; writers serialize read-modify-write through a lock file and replace the
+    index atomically so readers never see a partial write.
+    """
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self.runs_dir = self.settings.data_root / "runs"
+        self.index_path = self.runs_dir / "index.json"
+        self.lock_path = self.runs_dir / "index.lock"
+
+    @property
+    def paths(self) -> tuple[Path, ...]:
+        return self.index_path, self.lock_path, self.runs_dir / "progress.json"
+
+    def load(self) -> dict[str, Any]:
+        if not self.index_path.exists():
+            return self.rebuild()
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Rebuilding unreadable run index %s: %s", self.index_path, exc)
+            return self.rebuild()
+        return index if index.get("version") == INDEX_VERSION else self.rebuild()
+
+    def record(self, run_path: Path, results: Sequence[PipelineResult]) -> dict[str, Any]:
+        run, shorts = summarize_run(run_path.stem, results)
+        run["runFile"] = run_path.name
+        with file_lock(self.lock_path):
+            index = self._read()
+            if index is None:
+                # Missing or outdated index: backfill from the archives, which already include this run.
+                self._rebuild_locked()
+                return run
+            self._add(index, run, shorts)
+            _write_atomic(self.index_path, index)
+        return run
+
+    def rebuild(self) -> dict[str, Any]:
+        """One-off backfill from the archived run files (oldest first)."""
+        with file_lock(self.lock_path):
+            return self._rebuild_locked()
+
+    def _rebuild_locked(self) -> dict[str, Any]:
+        index = self._empty()
+        for run_path in sorted(self.runs_dir.glob("run_*.json")):
+            try:
+                records = json.loads(run_path.read_text(encoding="utf-8"))
+                results = [PipelineResult.parse_obj(record) for record in records]
+            except (OSError, ValueError) as exc:
+                logger.warning("Skipping unreadable run archive %s: %s", run_path, exc)
+                continue
+            run, shorts = summarize_run(run_path.stem, results)
+            run["runFile"] = run_path.name
+            self._add(index, run, shorts)
+        _write_atomic(self.index_path, index)
+        return index
+
+    @staticmethod
+    def _empty() -> dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "updatedAt": None,
+            "totals": {"runs": 0, "sourcesProcessed": 0, "shortsRendered": 0, "shortsPublished": 0},
+            "runs": [],
+            "latestShorts": [],
+        }
+
+    @staticmethod
+    def _add(index: dict[str, Any], run: dict[str, Any], shorts: list[dict[str, Any]]) -> None:
+        totals = index["totals"]
+        totals["runs"] += 1
+        for key in ("sourcesProcessed", "shortsRendered", "shortsPublished"):
+            totals[key] += run[key]
+        index["runs"] = [run, *index["runs"]][:MAX_INDEXED_RUNS]
+        index["latestShorts"] = [*shorts, *index["latestShorts"]][:MAX_LATEST_SHORTS]
+        index["updatedAt"] = _now()
+
+    def _read(self) -> dict[str, Any] | None:
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return index if index.get("version") == INDEX_VERSION else None
+
+
+class RunProgress:
+    """Live ``runs/progress.json`` for an in-process run, rewritten atomically on every change."""
+
+    def __init__(self) -> None:
+        self.path = get_settings().data_root / "runs" / "progress.json"
+        self.state: dict[str, Any] = {}
+
+    def start(self, sources_total: int) -> None:
+        started = _now()
+        self.state = {
+            "isRunning": True,
+            "startedAt": started,
+            "updatedAt": started,
+            "stage": "collect",
+            "sourceId": None,
+            "sourcesTotal": sources_total,
+            "sourcesDone": 0,
+            "sourcesFailed": 0,
+            "shortsRendered": 0,
+            "shortsPublished": 0,
+        }
+        self._write()
+
+    def update(self, **fields: Any) -> None:
+        if not self.state:
+            return
+        self.state.update(fields, updatedAt=_now())
+        self._write()
+
+    def advance(self, result: PipelineResult | None) -> None:
+        """Count one finished source; ``None`` marks it failed."""
+        if not self.state:
+            return
+        state = self.state
+        state["sourcesDone"] += 1
+        if result is None:
+            state["sourcesFailed"] += 1
+        else:
+            state["shortsRendered"] += len(result.rendered_shorts)
+            state["shortsPublished"] += sum(short.upload_status == "uploaded" for short in result.rendered_shorts)
+        self.update()
+
+    def finish(self, run_id: str | None) -> None:
+        self.update(isRunning=False, stage=None, sourceId=None, runId=run_id, completedAt=_now())
+
+    def _write(self) -> None:
+        _write_atomic(self.path, self.state)
@@ -1,97 +1,139 @@
 from __future__ import annotations
 
-import math
-from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Iterable, List
 
-import librosa
 import numpy as np
-import torch
-from transformers import pipeline
 
 from ..config import get_settings
 from ..data_models import SourceVideo, ViralSegment
-from ..utils.logging import setup_logger
+from ..utils.logging import get_logger
+from ..utils.timeline import SegmentTimeline, WordTimeline
+from .audio_stream import pcm_to_float
+from .candidates import generate_windows, select_non_overlapping, window_means, window_sums
 
-logger = setup_logger("segmenter")
+logger = get_logger("segmenter")
 
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+SECONDS_PER_WORD = 0.6
+OPENING_WORDS = 20
+HOOK_SHORTLIST = 48
+HOOK_BATCH_SIZE = 16
+MAX_SEGMENTS = 5
 
-@dataclass
-class TranscriptSegment:
-    start: float
-    end: float
-    text: str
+
+class StreamingEnergy:
+    """Incremental ``librosa.feature.rms`` (centered, zero-padded) over streamed PCM chunks."""
+
+    def __init__(self) -> None:
+        self._pending = np.zeros(FRAME_LENGTH // 2, dtype=np.float32)
+        self._frames: list[np.ndarray] = []
+
+    def feed(self, chunk: bytes) -> None:
+        self._pending = np.concatenate([self._pending, pcm_to_float(chunk)])
+        self._drain()
+
+    def _drain(self) -> None:
+        if len(self._pending) < FRAME_LENGTH:
+            return
+        count = 1 + (len(self._pending) - FRAME_LENGTH) // HOP_LENGTH
+        windows = np.lib.stride_tricks.sliding_window_view(self._pending, FRAME_LENGTH)[::HOP_LENGTH][:count]
+        self._frames.append(np.sqrt(np.mean(np.square(windows), axis=1)))
+        self._pending = self._pending[count * HOP_LENGTH :]
+
+    def finalize(self) -> np.ndarray:
+        self._pending = np.concatenate([self._pending, np.zeros(FRAME_LENGTH // 2, dtype=np.float32)])
+        self._drain()
+        energy = np.concatenate(self._frames) if self._frames else np.zeros(0, dtype=np.float32)
+        return normalize_energy(energy)
+
+
+def normalize_energy(energy: np.ndarray) -> np.ndarray:
+    if len(energy) == 0:
+        return energy
+    return (energy - energy.min()) / (energy.max() - energy.min() + 1e-9)
 
 
 class ViralSegmentDetector:
     def __init__(self) -> None:
         self.settings = get_settings()
-        self.keyword_classifier = pipeline(
+
+    @cached_property
+    def keyword_classifier(self):
+        import torch
+        from transformers import pipeline
+
+        return pipeline(
             "text-classification",
             model="facebook/bart-large-mnli",
             device=0 if torch.cuda.is_available() else -1,
         )
 
-    def detect_segments(self, video: SourceVideo, transcript_text: str, audio_path: Path) -> list[ViralSegment]:
-        energy_scores = self._sample_audio_energy(audio_path)
-        transcript_segments = self._split_transcript(transcript_text)
-        viral_segments: list[ViralSegment] = []
-
-        for segment in transcript_segments:
-            hook_score = self._score_hook(segment.text)
-            energy_score = self._aggregate_energy(energy_scores, segment.start, segment.end)
-            keywords = self._extract_keywords(segment.text)
-            if hook_score + energy_score < 1.5:
-                continue
-            viral_segments.append(
-                ViralSegment(
-                    source_video_id=video.id,
-                    start_time=segment.start,
-                    end_time=segment.end,
-                    hook_score=hook_score,
-                    energy_score=energy_score,
-                    keywords=keywords,
-                    transcript_snippet=segment.text,
-                )
-            )
-        viral_segments.sort(key=lambda s: (s.hook_score + s.energy_score), reverse=True)
-        return viral_segments[:5]
-
-    def _split_transcript(self, transcript_text: str) -> list[TranscriptSegment]:
-        sentences = [s.strip() for s in transcript_text.split(".") if s.strip()]
-        segments: list[TranscriptSegment] = []
-        cursor = 0.0
-        for sentence in sentences:
-            duration = max(5.0, min(len(sentence.split()) * 0.6, 60.0))
-            segments.append(TranscriptSegment(start=cursor, end=cursor + duration, text=sentence))
-            cursor += duration * 0.9  # overlap to allow better segmentation
-        return segments
+    def detect_segments(
+        self,
+        video: SourceVideo,
+        transcript_text: str,
+        audio_path: Path | None = None,
+        energy: np.ndarray | None = None,
+    ) -> list[ViralSegment]:
+        """Pass either the extracted ``audio_path`` or a precomputed, normalized RMS ``energy`` profile."""
+        if energy is None:
+            if audio_path is None:
+                raise ValueError("detect_segments needs an audio path or an energy profile")
+            energy = self._sample_audio_energy(audio_path)
+        frame_duration = HOP_LENGTH / SAMPLE_RATE
+        duration = len(energy) * frame_duration
+        words = WordTimeline.from_text(transcript_text, duration, SECONDS_PER_WORD)
+
+        starts, ends = generate_windows(duration)
+        candidates = SegmentTimeline.from_windows(starts, ends, words)
+        candidates["energy"][:] = np.sqrt(window_means(energy, frame_duration, starts, ends))
+        candidates["text"][:] = self._score_text_features(words, candidates)
+
+        # Shortlist on the cheap energy and text features, then hook-score only the shortlist
+        # in one batched transformer call.
+        shortlist = candidates.take(
+            np.argsort(-(candidates["energy"] + candidates["text"]), kind="stable")[:HOOK_SHORTLIST]
+        )
+        openings = [words.text(lo, lo + OPENING_WORDS) for lo in shortlist["word_lo"].tolist()]
+        shortlist["hook"][:] = self._score_hooks(openings)
+        shortlist["total"][:] = shortlist["hook"] + shortlist["energy"]
+        shortlist = shortlist.take(np.flatnonzero(shortlist["total"] >= 1.5))
+
+        picks = select_non_overlapping(shortlist["start"], shortlist["end"], shortlist["total"], limit=MAX_SEGMENTS)
+        return shortlist.take(picks).to_models(video.id, words, self._extract_keywords)
+
+    @staticmethod
+    def _score_text_features(words: WordTimeline, candidates: SegmentTimeline) -> np.ndarray:
+        if not len(words):
+            return np.zeros(len(candidates))
+        word_lo, word_hi = candidates["word_lo"], candidates["word_hi"]
+        lengths = candidates["end"] - candidates["start"]
+        is_keyword = words.flags(lambda word: len(word) > 4).astype(np.float64)
+        is_hook_mark = words.flags(lambda word: word[-1] in "?!").astype(np.float64)
+        word_count = np.maximum(word_hi - word_lo, 1)
+        keyword_density = window_sums(is_keyword, word_lo, word_hi) / word_count
+        hook_marks = window_sums(is_hook_mark, word_lo, word_hi) / word_count
+        speech_rate = np.minimum((word_hi - word_lo) / np.maximum(lengths, 1e-9) / 3.0, 1.0)
+        return 0.4 * keyword_density + 0.3 * np.minimum(hook_marks * 10, 1.0) + 0.3 * speech_rate
 
     def _sample_audio_energy(self, audio_path: Path) -> np.ndarray:
-        y, sr = librosa.load(audio_path, sr=16000)
-        frame_length = 2048
-        hop_length = 512
-        energy = librosa.feature.rms(y=y, frame_length=frame_length, hop_length=hop_length)[0]
-        normalized = (energy - energy.min()) / (energy.max() - energy.min() + 1e-9)
-        return normalized
-
-    def _aggregate_energy(self, energy: np.ndarray, start: float, end: float) -> float:
-        sr = 16000
-        hop_length = 512
-        frame_duration = hop_length / sr
-        idx_start = int(start / frame_duration)
-        idx_end = int(end / frame_duration)
-        idx_end = min(idx_end, len(energy) - 1)
-        window = energy[idx_start:idx_end] if idx_end > idx_start else energy[idx_start : idx_start + 1]
-        score = float(np.mean(window))
-        return math.sqrt(score)
-
-    def _score_hook(self, text: str) -> float:
-        prompt = f"This is the opening hook of a viral short: {text[:120]}"
-        result = self.keyword_classifier(prompt, truncation=True)[0]
-        score = result["score"]
-        return float(score)
+        import librosa
+
+        y, sr = librosa.load(audio_path, sr=SAMPLE_RATE)
+        energy = librosa.feature.rms(y=y, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH)[0]
+        return normalize_energy(energy)
+
+    def _score_hooks(self, openings: list[str]) -> np.ndarray:
+        if not openings:
+            return np.zeros(0)
+        unique = list(dict.fromkeys(openings))
+        prompts = [f"This is the opening hook of a viral short: {text[:120]}" for text in unique]
+        results = self.keyword_classifier(prompts, truncation=True, batch_size=HOOK_BATCH_SIZE)
+        by_opening = {text: float(result["score"]) for text, result in zip(unique, results)}
+        return np.array([by_opening[text] for text in openings])
 
     def _extract_keywords(self, text: str) -> list[str]:
         doc = text.lower()
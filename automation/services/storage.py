@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from ..config import get_settings
+from ..data_models import PipelineResult, SourceVideo
+from ..utils.logging import get_logger
+from .run_index import RunIndex
+
+if TYPE_CHECKING:
+    from ..task_queue import TaskQueue
+
+logger = get_logger("storage")
+
+MB = 1024 * 1024
+# Rough upper bounds used for pre-flight checks when the real size is unknown.
+DOWNLOAD_BYTES_PER_SECOND = 1 * MB
+DEFAULT_DOWNLOAD_BYTES = 1024 * MB
+RENDER_BYTES_PER_SECOND = 2 * MB
+RENDER_OVERHEAD_BYTES = 64 * MB
+
+
+class InsufficientStorageError(RuntimeError):
+    pass
+
+
+@dataclass
+class GarbageReport:
+    removed_files: int = 0
+    removed_bytes: int = 0
+
+
+class StorageManager:
+    """Quota, age and reference-aware cleanup of pipeline intermediates plus free-space checks."""
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self._pinned: set[Path] = set()
+        self._lock = threading.Lock()
+        # Set by stage workers so files referenced by queued or running tasks survive collection.
+        self.task_queue: TaskQueue | None = None
+
+    @property
+    def areas(self) -> dict[str, Path]:
+        data_root = self.settings.data_root
+        return {
+            "downloads": data_root / "downloads",
+            "audio": self.settings.tmp_root / "audio",
+            "transcripts": data_root / "transcripts",
+            "shorts": data_root / "shorts",
+            "analytics": data_root / "analytics",
+            "runs": data_root / "runs",
+            "cache": data_root / "cache",
+        }
+
+    @contextmanager
+    def pin(self, *paths: Path) -> Iterator[None]:
+        """Protect paths that in-flight work still needs from garbage collection."""
+        resolved = [Path(path).resolve() for path in paths]
+        with self._lock:
+            self._pinned.update(resolved)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pinned.difference_update(resolved)
+
+    def ensure_free_space(self, path: Path, required_bytes: int) -> None:
+        path.mkdir(parents=True, exist_ok=True)
+        reserve = self.settings.storage_min_free_mb * MB
+        if shutil.disk_usage(path).free - required_bytes >= reserve:
+            return
+        logger.warning("Low disk space under %s; collecting garbage before continuing", path)
+        self.collect_garbage()
+        free = shutil.disk_usage(path).free
+        if free - required_bytes < reserve:
+            raise InsufficientStorageError(
+                f"Need {required_bytes // MB} MB plus {reserve // MB} MB reserve under {path}, "
+                f"only {free // MB} MB free"
+            )
+
+    def ensure_download_space(self, source: SourceVideo) -> None:
+        estimate = (
+            source.duration_seconds * DOWNLOAD_BYTES_PER_SECOND if source.duration_seconds else DEFAULT_DOWNLOAD_BYTES
+        )
+        self.ensure_free_space(self.areas["downloads"], estimate)
+
+    def ensure_render_space(self, seconds: float) -> None:
+        self.ensure_free_space(self.areas["shorts"], int(seconds * RENDER_BYTES_PER_SECOND) + RENDER_OVERHEAD_BYTES)
+
+    def release_source(self, result: PipelineResult) -> int:
+        """Drop a source's download and audio once every short cut from it has been uploaded."""
+        if any(short.upload_status != "uploaded" for short in result.rendered_shorts):
+            return 0
+        if result.segments and not result.rendered_shorts:
+            return 0  # nothing rendered yet; keep the source for a retry
+        source = result.source
+        candidates = [source.downloaded_path] if source.downloaded_path else []
+        candidates += list(self.areas["downloads"].glob(f"*/{source.id}.*"))
+        candidates += list(self.areas["audio"].glob(f"{source.id}.*"))
+        removed = self._remove(path for path in candidates if path)
+        if removed.removed_files:
+            logger.info("Released %d MB of intermediates for %s", removed.removed_bytes // MB, source.id)
+        return removed.removed_bytes
+
+    def collect_garbage(self) -> GarbageReport:
+        report = GarbageReport()
+        protected = self._protected_paths()
+        now = time.time()
+        for area, root in self.areas.items():
+            if not root.exists():
+                continue
+            files = [(path, path.stat()) for path in root.rglob("*") if path.is_file()]
+            files = [(path, stat) for path, stat in files if path.resolve() not in protected]
+            files.sort(key=lambda item: item[1].st_mtime)
+
+            max_age_days = self.settings.storage_max_age_days.get(area)
+            if max_age_days is not None:
+                cutoff = now - max_age_days * 86400
+                expired = [path for path, stat in files if stat.st_mtime < cutoff]
+                self._merge(report, self._remove(expired))
+                files = [(path, stat) for path, stat in files if stat.st_mtime >= cutoff]
+
+            quota_mb = self.settings.storage_quotas_mb.get(area)
+            if quota_mb is not None:
+                usage = sum(stat.st_size for _, stat in files)
+                evict: list[Path] = []
+                for path, stat in files:  # oldest first
+                    if usage <= quota_mb * MB:
+                        break
+                    evict.append(path)
+                    usage -= stat.st_size
+                self._merge(report, self._remove(evict))
+        if report.removed_files:
+            logger.info("Garbage collection removed %d files (%d MB)", report.removed_files, report.removed_bytes // MB)
+        return report
+
+    def _protected_paths(self) -> set[Path]:
+        """Pinned paths, the run index files, and files named by queued or running tasks."""
+        with self._lock:
+            protected = set(self._pinned)
+        protected.update(path.resolve() for path in RunIndex().paths)
+        if self.task_queue is not None:
+            for payload in self.task_queue.active_payloads():
+                protected.update(Path(path).resolve() for path in _payload_paths(payload))
+        return protected
+
+    @staticmethod
+    def _remove(paths: Iterable[Path]) -> GarbageReport:
+        report = GarbageReport()
+        for path in paths:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            except OSError as exc:
+                logger.warning("Could not remove %s: %s", path, exc)
+                continue
+            report.removed_files += 1
+            report.removed_bytes += size
+        return report
+
+    @staticmethod
+    def _merge(report: GarbageReport, other: GarbageReport) -> None:
+        report.removed_files += other.removed_files
+        report.removed_bytes += other.removed_bytes
+
+
+def _payload_paths(value: Any) -> Iterator[str]:
+    """``*_path`` values anywhere in a task payload (downloads, audio, transcripts, rendered shorts)."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key.endswith("_path") and isinstance(item, str) and item:
+                yield item
+            else:
+                yield from _payload_paths(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _payload_paths(item)
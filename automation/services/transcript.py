@@ -3,21 +3,22 @@ from __future__ import annotations
 import asyncio
 import json
 from pathlib import Path
+from typing import BinaryIO
 
 import aiohttp
 
 from ..config import get_settings
 from ..data_models import SourceVideo
-from ..utils.logging import setup_logger
+from ..utils.logging import get_logger
 
-logger = setup_logger("transcript")
+logger = get_logger("transcript")
 
 
 class TranscriptGenerator:
     def __init__(self) -> None:
         self.settings = get_settings()
 
-    async def generate(self, video: SourceVideo, audio_path: Path) -> Path:
+    async def generate(self, video: SourceVideo, audio: Path | BinaryIO) -> Path:
         if not self.settings.openai_api_key:
             raise RuntimeError("OPENAI_API_KEY is required for transcription")
         transcript_dir = self.settings.data_root / "transcripts"
@@ -28,16 +29,22 @@ class TranscriptGenerator:
             headers = {
                 "Authorization": f"Bearer {self.settings.openai_api_key}",
             }
-            data = aiohttp.FormData()
-            data.add_field("file", open(audio_path, "rb"), filename=audio_path.name, content_type="audio/wav")
-            data.add_field("model", "whisper-1")
-            async with session.post(
-                "https://api.openai.com/v1/audio/transcriptions", data=data, headers=headers, timeout=120
-            ) as response:
-                if response.status != 200:
-                    text = await response.text()
-                    raise RuntimeError(f"Whisper API error: {response.status} {text}")
-                payload = await response.json()
+            # Streaming runs hand over an in-memory (or spilled) WAV instead of a path.
+            audio_file = open(audio, "rb") if isinstance(audio, Path) else audio
+            try:
+                data = aiohttp.FormData()
+                data.add_field("file", audio_file, filename=f"{video.id}.wav", content_type="audio/wav")
+                data.add_field("model", "whisper-1")
+                async with session.post(
+                    f"{self.settings.openai_api_base}/audio/transcriptions", data=data, headers=headers, timeout=120
+                ) as response:
+                    if response.status != 200:
+                        text = await response.text()
+                        raise RuntimeError(f"Whisper API error: {response.status} {text}")
+                    payload = await response.json()
+            finally:
+                if isinstance(audio, Path):
+                    audio_file.close()
 
         transcript_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
         video.transcript_path = transcript_path
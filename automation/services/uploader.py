@@ -10,9 +10,9 @@ from googleapiclient.http import MediaFileUpload
 
 from ..config import get_settings
 from ..data_models import RenderedShort
-from ..utils.logging import setup_logger
+from ..utils.logging import get_logger
 
-logger = setup_logger("uploader")
+logger = get_logger("uploader")
 
 
 class YouTubeUploader:
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from .config import get_settings
+from .utils.logging import get_logger
+
+logger = get_logger("task_queue")
+
+STAGES = ("download", "transcribe", "detect", "render", "upload")
+
+
+def check_stage(stage: str) -> None:
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage {stage!r}; expected one of {STAGES}")
+
+
+def claim_order(stages: Sequence[str]) -> list[str]:
+    """Later stages first, so sources already in flight finish before new ones start."""
+    return sorted(set(stages), key=STAGES.index, reverse=True)
+
+
+@dataclass
+class Task:
+    id: str
+    stage: str
+    payload: dict[str, Any]
+    attempts: int = 0
+    claimed_by: str | None = field(default=None, compare=False)
+
+
+class TaskQueue(ABC):
+    """Stage task queue shared by the coordinator and any number of workers."""
+
+    @abstractmethod
+    def enqueue(self, stage: str, payload: dict[str, Any]) -> str:
+        ...
+
+    @abstractmethod
+    def claim(self, stages: Sequence[str], worker_id: str) -> Task | None:
+        ...
+
+    @abstractmethod
+    def complete(self, task: Task) -> None:
+        ...
+
+    @abstractmethod
+    def fail(self, task: Task, error: str) -> None:
+        ...
+
+    @abstractmethod
+    def depth(self, stages: Sequence[str] | None = None) -> int:
+        ...
+
+    @abstractmethod
+    def active_payloads(self) -> list[dict[str, Any]]:
+        """Payloads of every pending or running task."""
+
+
+class SQLiteTaskQueue(TaskQueue):
+    """Single-file queue for one host (or hosts sharing a local-semantics filesystem)."""
+
+    def __init__(self, path: Path, max_attempts: int, lease_seconds: int) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY,
+                    stage TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    claimed_by TEXT,
+                    lease_expires REAL,
+                    error TEXT,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_pending ON tasks (status, stage, created_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, stage: str, payload: dict[str, Any]) -> str:
+        check_stage(stage)
+        task_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO tasks (id, stage, payload, created_at) VALUES (?, ?, ?, ?)",
+                (task_id, stage, json.dumps(payload), time.time()),
+            )
+        return task_id
+
+    def claim(self, stages: Sequence[str], worker_id: str) -> Task | None:
+        now = time.time()
+        row = None
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Tasks whose worker vanished past its lease go back to the pool.
+                conn.execute(
+                    "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                    "claimed_by = NULL, lease_expires = NULL WHERE status = 'running' AND lease_expires < ?",
+                    (self.max_attempts, now),
+                )
+                for stage in claim_order(stages):
+                    row = conn.execute(
+                        "SELECT id, stage, payload, attempts FROM tasks WHERE status = 'pending' "
+                        "AND stage = ? ORDER BY created_at LIMIT 1",
+                        (stage,),
+                    ).fetchone()
+                    if row is not None:
+                        break
+                if row is not None:
+                    conn.execute(
+                        "UPDATE tasks SET status = 'running', claimed_by = ?, lease_expires = ?, "
+                        "attempts = attempts + 1 WHERE id = ?",
+                        (worker_id, now + self.lease_seconds, row[0]),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return Task(id=row[0], stage=row[1], payload=json.loads(row[2]), attempts=row[3] + 1, claimed_by=worker_id)
+
+    def complete(self, task: Task) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE tasks SET status = 'done', lease_expires = NULL WHERE id = ?", (task.id,))
+
+    def fail(self, task: Task, error: str) -> None:
+        status = "failed" if task.attempts >= self.max_attempts else "pending"
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = ?, claimed_by = NULL, lease_expires = NULL, error = ? WHERE id = ?",
+                (status, error, task.id),
+            )
+
+    def depth(self, stages: Sequence[str] | None = None) -> int:
+        stages = tuple(stages or STAGES)
+        placeholders = ",".join("?" for _ in stages)
+        with self._connect() as conn:
+            (count,) = conn.execute(
+                f"SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'running') AND stage IN ({placeholders})",
+                stages,
+            ).fetchone()
+        return int(count)
+
+    def active_payloads(self) -> list[dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT payload FROM tasks WHERE status IN ('pending', 'running')").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+# Pop the oldest task of a stage and register its lease in one step, so a worker dying
+# between the two cannot drop the task.
+CLAIM_SCRIPT = """
+local body = redis.call('RPOP', KEYS[1])
+if not body then
+    return nil
+end
+local task_id = cjson.decode(body)['id']
+local attempts = redis.call('HINCRBY', KEYS[4], task_id, 1)
+redis.call('HSET', KEYS[2], task_id, body)
+redis.call('ZADD', KEYS[3], ARGV[1], task_id)
+return {body, attempts}
+"""
+
+# Return expired leases of a stage to its list, or to the failed list once out of attempts.
+REQUEUE_SCRIPT = """
+local requeued = 0
+for _, task_id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[1], 0, ARGV[1])) do
+    redis.call('ZREM', KEYS[1], task_id)
+    local body = redis.call('HGET', KEYS[2], task_id)
+    redis.call('HDEL', KEYS[2], task_id)
+    if body then
+        local attempts = tonumber(redis.call('HGET', KEYS[3], task_id) or '0')
+        if attempts >= tonumber(ARGV[2]) then
+            redis.call('HDEL', KEYS[3], task_id)
+            redis.call('LPUSH', KEYS[5], '{"error": "lease expired", "task": ' .. body .. '}')
+        else
+            redis.call('LPUSH', KEYS[4], body)
+            requeued = requeued + 1
+        end
+    end
+end
+return requeued
+"""
+
+
+class RedisTaskQueue(TaskQueue):
+    """Multi-host queue: one Redis list per stage plus per-stage lease sorted sets for in-flight tasks.
+
+    Claims and lease expiry run as Lua scripts so a task is always either queued or leased.
+    """
+
+    def __init__(self, url: str, max_attempts: int, lease_seconds: int, prefix: str = "pipeline") -> None:
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.prefix = prefix
+        self._claim_script = self.client.register_script(CLAIM_SCRIPT)
+        self._requeue_script = self.client.register_script(REQUEUE_SCRIPT)
+
+    def _key(self, *parts: str) -> str:
+        return ":".join([self.prefix, *parts])
+
+    def enqueue(self, stage: str, payload: dict[str, Any]) -> str:
+        check_stage(stage)
+        task = Task(id=uuid.uuid4().hex, stage=stage, payload=payload)
+        self.client.lpush(self._key("stage", stage), self._body(task))
+        return task.id
+
+    @staticmethod
+    def _body(task: Task) -> str:
+        return json.dumps({"id": task.id, "stage": task.stage, "payload": task.payload})
+
+    def claim(self, stages: Sequence[str], worker_id: str) -> Task | None:
+        self._requeue_expired()
+        for stage in claim_order(stages):
+            claimed = self._claim_script(
+                keys=[
+                    self._key("stage", stage),
+                    self._key("inflight"),
+                    self._key("leases", stage),
+                    self._key("attempts"),
+                ],
+                args=[time.time() + self.lease_seconds],
+            )
+            if claimed is None:
+                continue
+            body, attempts = claimed
+            data = json.loads(body)
+            return Task(
+                id=data["id"],
+                stage=data["stage"],
+                payload=data["payload"],
+                attempts=int(attempts),
+                claimed_by=worker_id,
+            )
+        return None
+
+    def _requeue_expired(self) -> None:
+        for stage in STAGES:
+            self._requeue_script(
+                keys=[
+                    self._key("leases", stage),
+                    self._key("inflight"),
+                    self._key("attempts"),
+                    self._key("stage", stage),
+                    self._key("failed"),
+                ],
+                args=[time.time(), self.max_attempts],
+            )
+
+    def complete(self, task: Task) -> None:
+        pipe = self.client.pipeline()
+        pipe.zrem(self._key("leases", task.stage), task.id)
+        pipe.hdel(self._key("inflight"), task.id)
+        pipe.hdel(self._key("attempts"), task.id)
+        pipe.execute()
+
+    def fail(self, task: Task, error: str) -> None:
+        body = self._body(task)
+        pipe = self.client.pipeline()  # MULTI/EXEC: lease release and requeue land together
+        pipe.zrem(self._key("leases", task.stage), task.id)
+        pipe.hdel(self._key("inflight"), task.id)
+        if task.attempts >= self.max_attempts:
+            pipe.hdel(self._key("attempts"), task.id)
+            pipe.lpush(self._key("failed"), json.dumps({"error": error, "task": json.loads(body)}))
+        else:
+            pipe.lpush(self._key("stage", task.stage), body)
+        pipe.execute()
+
+    def depth(self, stages: Sequence[str] | None = None) -> int:
+        pipe = self.client.pipeline()
+        for stage in stages or STAGES:
+            pipe.llen(self._key("stage", stage))
+            pipe.zcard(self._key("leases", stage))
+        return int(sum(pipe.execute()))
+
+    def active_payloads(self) -> list[dict[str, Any]]:
+        pipe = self.client.pipeline()
+        for stage in STAGES:
+            pipe.lrange(self._key("stage", stage), 0, -1)
+        pipe.hvals(self._key("inflight"))
+        return [json.loads(body)["payload"] for bodies in pipe.execute() for body in bodies]
+
+
+def get_task_queue(url: str | None = None) -> TaskQueue:
+    settings = get_settings()
+    url = url or settings.queue_url or f"sqlite:///{settings.data_root / 'queue.db'}"
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisTaskQueue(url, settings.task_max_attempts, settings.task_lease_seconds)
+    if url.startswith("sqlite:///"):
+        return SQLiteTaskQueue(Path(url[len("sqlite:///") :]), settings.task_max_attempts, settings.task_lease_seconds)
+    raise ValueError(f"Unsupported queue URL: {url}")
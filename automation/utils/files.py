@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import fcntl
+import threading
+import uuid
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Hashable, Iterator
+
+
+@contextmanager
+def atomic_write(path: Path) -> Iterator[Path]:
+    """Yield a unique temporary path next to ``path`` that replaces it once the block succeeds.
+
+    The temporary name keeps ``path``'s suffix so ``np.save``/``np.savez`` do not append another.
+    Concurrent writers each get their own file; the last ``replace`` wins and readers never see
+    a partial write.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.stem}.{uuid.uuid4().hex[:12]}.tmp{path.suffix}")
+    try:
+        yield tmp_path
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    with atomic_write(path) as tmp_path:
+        tmp_path.write_text(text, encoding="utf-8")
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Exclusive ``flock`` on ``path``, serializing read-modify-write across processes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class KeyedLocks:
+    """One ``threading.Lock`` per key, dropped once no thread holds or waits on it."""
+
+    def __init__(self) -> None:
+        self._locks: weakref.WeakValueDictionary[Hashable, threading.Lock] = weakref.WeakValueDictionary()
+        self._guard = threading.Lock()
+
+    def __call__(self, key: Hashable) -> threading.Lock:
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
@@ -1,27 +1,116 @@
 from __future__ import annotations
 
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
-from pathlib import Path
+import queue
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Iterator
 
 from ..config import get_settings
 
+ROOT_LOGGER = "automation"
+CONTEXT_FIELDS = ("source_id", "stage")
+
+_context: ContextVar[dict[str, Any]] = ContextVar("log_context", default={})
+_listener: QueueListener | None = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Module-level loggers: no handlers or file I/O until an entrypoint calls ``setup_logger``."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """Attach fields such as ``source_id`` and ``stage`` to every record logged inside the block."""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    # Runs on the QueueHandler, i.e. in the logging thread/task, where the context is visible.
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _context.get()
+        for field in CONTEXT_FIELDS:
+            setattr(record, field, context.get(field))
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Keeps one in every ``1 / rate`` DEBUG records per call site; other levels always pass."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counts: dict[tuple[str, int], int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.DEBUG:
+            return True
+        if self.every == 0:
+            return False
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            count = self._counts[key]
+            self._counts[key] = count + 1
+        return count % self.every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "file": f"{record.filename}:{record.lineno}",
+            "process": record.process,
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
 
 def setup_logger(name: str = "pipeline") -> logging.Logger:
-    settings = get_settings()
-    log_dir = settings.data_root / "logs"
-    log_dir.mkdir(parents=True, exist_ok=True)
-    handler = RotatingFileHandler(log_dir / f"{name}.log", maxBytes=5_000_000, backupCount=5)
-    formatter = logging.Formatter(
-        "[%(asctime)s] [%(levelname)s] %(name)s - %(message)s (%(filename)s:%(lineno)d)"
-    )
-    handler.setFormatter(formatter)
-
-    logger = logging.getLogger(name)
-    if not logger.handlers:
-        logger.setLevel(logging.INFO)
-        logger.addHandler(handler)
+    """Route the package logger through one queue so log I/O happens off the calling thread.
+
+    Records are enqueued by a ``QueueHandler`` and written by a single ``QueueListener``
+    thread to one JSON-lines file sink (``<data_root>/logs/<name>.log``) and the console.
+    """
+    global _listener
+    root = logging.getLogger(ROOT_LOGGER)
+    if _listener is None:
+        settings = get_settings()
+        log_dir = settings.data_root / "logs"
+        log_dir.mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(log_dir / f"{name}.log", maxBytes=5_000_000, backupCount=5)
+        file_handler.setFormatter(JsonFormatter())
         stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
-    return logger
+        stream_handler.setFormatter(
+            logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s - %(message)s (%(filename)s:%(lineno)d)")
+        )
+
+        records: queue.Queue[logging.LogRecord] = queue.Queue(-1)
+        queue_handler = QueueHandler(records)
+        queue_handler.addFilter(ContextFilter())
+        queue_handler.addFilter(DebugSamplingFilter(settings.log_debug_sample_rate))
+        root.setLevel(settings.log_level.upper())
+        root.addHandler(queue_handler)
+        root.propagate = False
+
+        _listener = QueueListener(records, file_handler, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    return get_logger(name)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import resource
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator
+
+from ..config import get_settings
+from .files import write_text_atomic
+from .logging import log_context
+
+RECENT_SPANS = 2048
+
+
+@dataclass
+class Span:
+    stage: str
+    source_id: str | None
+    started_at: float
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    items: int = 0
+    status: str = "ok"
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "items_per_second": self.items_per_second}
+
+
+def _cpu_seconds() -> float:
+    # Include reaped children so ffmpeg encodes count against the stage that waited on them.
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _io_bytes() -> tuple[int, int]:
+    try:
+        counters = dict(
+            line.split(": ", 1) for line in Path("/proc/self/io").read_text(encoding="utf-8").splitlines()
+        )
+        return int(counters["rchar"]), int(counters["wchar"])
+    except (OSError, KeyError, ValueError):
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_inblock * 512, usage.ru_oublock * 512
+
+
+class MetricsRecorder:
+    """Collects per-stage spans for this process and exports them as Prometheus text.
+
+    CPU and I/O counters are process-wide, so spans that overlap (concurrent renders,
+    gathered coroutines) each see the combined usage of everything running alongside them.
+    """
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self._recent: deque[Span] = deque(maxlen=RECENT_SPANS)
+        self._totals: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._counters: dict[tuple[str, str, str], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str, source_id: str | None = None) -> Iterator[Span]:
+        span = Span(stage=stage, source_id=source_id, started_at=time.time())
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_seconds()
+        read_start, written_start = _io_bytes()
+        context = {"stage": stage, **({"source_id": source_id} if source_id else {})}
+        try:
+            with log_context(**context):
+                yield span
+        except BaseException:
+            span.status = "error"
+            raise
+        finally:
+            read_end, written_end = _io_bytes()
+            span.wall_seconds = time.perf_counter() - wall_start
+            span.cpu_seconds = _cpu_seconds() - cpu_start
+            span.peak_rss_bytes = _peak_rss_bytes()
+            span.bytes_in += read_end - read_start
+            span.bytes_out += written_end - written_start
+            self._record(span)
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self._recent.append(span)
+            stage = self._totals[span.stage]
+            stage["count"] += 1
+            stage["errors"] += span.status != "ok"
+            stage["wall_seconds"] += span.wall_seconds
+            stage["cpu_seconds"] += span.cpu_seconds
+            stage["bytes_in"] += span.bytes_in
+            stage["bytes_out"] += span.bytes_out
+            stage["items"] += span.items
+            stage["peak_rss_bytes"] = max(stage["peak_rss_bytes"], span.peak_rss_bytes)
+
+    def increment(self, name: str, label: str, value: str, amount: float = 1.0) -> None:
+        """Bump a labelled counter exported as ``pipeline_<name>_total{<label>="<value>"}``."""
+        with self._lock:
+            self._counters[(name, label, value)] += amount
+
+    def counters(self) -> dict[tuple[str, str, str], float]:
+        with self._lock:
+            return dict(self._counters)
+
+    def spans_for(self, source_id: str) -> list[dict[str, Any]]:
+        with self._lock:
+            return [span.to_dict() for span in self._recent if span.source_id == source_id]
+
+    def stage_totals(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {name: dict(values) for name, values in self._totals.items()}
+
+    def render_prometheus(self) -> str:
+        totals = self.stage_totals()
+        series = [
+            ("pipeline_stage_runs_total", "counter", "Completed stage spans.", "count"),
+            ("pipeline_stage_errors_total", "counter", "Stage spans that raised.", "errors"),
+            ("pipeline_stage_wall_seconds_total", "counter", "Wall-clock time spent in the stage.", "wall_seconds"),
+            ("pipeline_stage_cpu_seconds_total", "counter", "CPU time (incl. child processes).", "cpu_seconds"),
+            ("pipeline_stage_bytes_in_total", "counter", "Bytes read while the stage ran.", "bytes_in"),
+            ("pipeline_stage_bytes_out_total", "counter", "Bytes written while the stage ran.", "bytes_out"),
+            ("pipeline_stage_items_total", "counter", "Items processed by the stage.", "items"),
+            ("pipeline_stage_peak_rss_bytes", "gauge", "Process peak RSS observed at stage end.", "peak_rss_bytes"),
+        ]
+        lines: list[str] = []
+        for name, kind, help_text, key in series:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for stage, values in sorted(totals.items()):
+                lines.append(f'{name}{{stage="{stage}"}} {float(values[key])!r}')
+        lines.append("# HELP pipeline_stage_items_per_second Items per wall-clock second across all spans.")
+        lines.append("# TYPE pipeline_stage_items_per_second gauge")
+        for stage, values in sorted(totals.items()):
+            rate = values["items"] / values["wall_seconds"] if values["wall_seconds"] > 0 else 0.0
+            lines.append(f'pipeline_stage_items_per_second{{stage="{stage}"}} {rate!r}')
+        declared: set[str] = set()
+        for (name, label, value), count in sorted(self.counters().items()):
+            metric = f"pipeline_{name}_total"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            lines.append(f'{metric}{{{label}="{value}"}} {float(count)!r}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, name: str = "pipeline") -> Path:
+        path = self.settings.data_root / "metrics" / f"{name}.prom"
+        write_text_atomic(path, self.render_prometheus())
+        return path
+
+
+@lru_cache
+def get_metrics() -> MetricsRecorder:
+    return MetricsRecorder()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable, Sequence
+
+import numpy as np
+
+from ..data_models import ViralSegment
+
+WORD_DTYPE = np.dtype([("start", np.float64), ("end", np.float64), ("token", np.int32)])
+SEGMENT_DTYPE = np.dtype(
+    [
+        ("start", np.float64),
+        ("end", np.float64),
+        ("energy", np.float64),
+        ("text", np.float64),
+        ("hook", np.float64),
+        ("total", np.float64),
+        ("word_lo", np.int32),
+        ("word_hi", np.int32),
+    ]
+)
+
+
+class StringTable:
+    """Interns strings so timelines store int32 token IDs instead of one object per entry."""
+
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def intern_many(self, values: Iterable[str]) -> np.ndarray:
+        ids = self._ids
+        strings = self.strings
+        tokens = []
+        for value in values:
+            token = ids.get(value)
+            if token is None:
+                token = ids[value] = len(strings)
+                strings.append(value)
+            tokens.append(token)
+        return np.array(tokens, dtype=np.int32)
+
+    def flags(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        """Evaluate ``predicate`` once per distinct string; index the result with token IDs."""
+        return np.fromiter((predicate(value) for value in self.strings), dtype=bool, count=len(self.strings))
+
+    def join(self, tokens: np.ndarray, separator: str = " ") -> str:
+        strings = self.strings
+        return separator.join(strings[token] for token in tokens)
+
+
+class WordTimeline:
+    """Transcript words as one structured array (start, end, token) plus a shared string table."""
+
+    def __init__(self, words: np.ndarray, table: StringTable) -> None:
+        self.words = words
+        self.table = table
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @classmethod
+    def from_text(cls, text: str, duration: float, seconds_per_word: float) -> WordTimeline:
+        """Without word timestamps, spread the transcript evenly over ``duration``."""
+        table = StringTable()
+        tokens = table.intern_many(text.split())
+        count = len(tokens)
+        step = duration / count if count and duration > 0 else seconds_per_word
+        words = np.empty(count, dtype=WORD_DTYPE)
+        words["start"] = np.arange(count) * step
+        words["end"] = words["start"] + step
+        words["token"] = tokens
+        return cls(words, table)
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self.words["start"]
+
+    def flags(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        return self.table.flags(predicate)[self.words["token"]]
+
+    def text(self, lo: int, hi: int) -> str:
+        return self.table.join(self.words["token"][lo:hi])
+
+
+class SegmentTimeline:
+    """Candidate windows and their scores as a single structured array."""
+
+    def __init__(self, segments: np.ndarray) -> None:
+        self.segments = segments
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.segments[field]
+
+    @classmethod
+    def from_windows(cls, starts: np.ndarray, ends: np.ndarray, words: WordTimeline) -> SegmentTimeline:
+        segments = np.zeros(len(starts), dtype=SEGMENT_DTYPE)
+        segments["start"] = starts
+        segments["end"] = ends
+        segments["word_lo"] = np.searchsorted(words.starts, starts, side="left")
+        segments["word_hi"] = np.searchsorted(words.starts, ends, side="left")
+        return cls(segments)
+
+    def take(self, indices: Sequence[int] | np.ndarray) -> SegmentTimeline:
+        return SegmentTimeline(self.segments[np.asarray(indices, dtype=np.int64)])
+
+    def to_models(
+        self, source_video_id: str, words: WordTimeline, keywords: Callable[[str], list[str]]
+    ) -> list[ViralSegment]:
+        """Materialize pydantic models; only the final picks ever cross this boundary."""
+        models: list[ViralSegment] = []
+        for row in self.segments:
+            text = words.text(int(row["word_lo"]), int(row["word_hi"]))
+            models.append(
+                ViralSegment(
+                    source_video_id=source_video_id,
+                    start_time=float(row["start"]),
+                    end_time=float(row["end"]),
+                    hook_score=float(row["hook"]),
+                    energy_score=float(row["energy"]),
+                    keywords=keywords(text),
+                    transcript_snippet=text,
+                )
+            )
+        return models
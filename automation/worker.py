@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Sequence
+
+from pydantic import BaseModel
+
+from .config import get_settings
+from .data_models import RenderedShort, SourceVideo, ViralSegment
+from .pipeline import Pipeline
+from .task_queue import STAGES, Task, TaskQueue, check_stage, get_task_queue
+from .utils.logging import get_logger, log_context, setup_logger
+
+logger = get_logger("worker")
+
+
+def _dump(model: BaseModel) -> dict[str, Any]:
+    return json.loads(model.json())
+
+
+class StageWorker:
+    """Pulls stage tasks it is capable of from the queue and enqueues the follow-up stage."""
+
+    def __init__(self, stages: Sequence[str], queue: TaskQueue | None = None, worker_id: str | None = None) -> None:
+        self.settings = get_settings()
+        for stage in stages:
+            check_stage(stage)
+        self.stages = tuple(stages)
+        self.queue = queue or get_task_queue()
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.pipeline = Pipeline()
+        self.pipeline.storage.task_queue = self.queue
+
+    async def run(self, max_tasks: int | None = None, exit_when_idle: bool = False) -> int:
+        logger.info("Worker %s serving stages %s", self.worker_id, ",".join(self.stages))
+        processed = 0
+        while max_tasks is None or processed < max_tasks:
+            task = await asyncio.to_thread(self.queue.claim, self.stages, self.worker_id)
+            if task is None:
+                if exit_when_idle:
+                    break
+                await asyncio.sleep(self.settings.worker_poll_seconds)
+                continue
+            await self.process(task)
+            processed += 1
+        return processed
+
+    async def process(self, task: Task) -> None:
+        try:
+            with log_context(source_id=task.payload.get("source", {}).get("id"), stage=task.stage):
+                follow_ups = await self._handle(task)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Task %s (%s) failed on attempt %d: %s", task.id, task.stage, task.attempts, exc)
+            self.queue.fail(task, str(exc))
+            return
+        for stage, payload in follow_ups:
+            self.queue.enqueue(stage, payload)
+        self.queue.complete(task)
+        self.pipeline.metrics.write_prometheus(f"worker_{self.worker_id}")
+
+    async def _handle(self, task: Task) -> list[tuple[str, dict[str, Any]]]:
+        payload = task.payload
+        pipeline = self.pipeline
+        source = SourceVideo.parse_obj(payload["source"])
+
+        if task.stage == "download":
+            source = await asyncio.to_thread(pipeline.download, source)
+            return [("transcribe", {"source": _dump(source)})]
+
+        if task.stage == "transcribe":
+            audio_path, energy_path, transcript_path = await pipeline.transcribe(source)
+            return [
+                (
+                    "detect",
+                    {
+                        "source": _dump(source),
+                        "audio_path": str(audio_path) if audio_path else None,
+                        "energy_path": str(energy_path) if energy_path else None,
+                        "transcript_path": str(transcript_path),
+                    },
+                )
+            ]
+
+        if task.stage == "detect":
+            audio_path, energy_path = payload.get("audio_path"), payload.get("energy_path")
+            segments = await asyncio.to_thread(
+                pipeline.detect,
+                source,
+                Path(payload["transcript_path"]),
+                audio_path=Path(audio_path) if audio_path else None,
+                energy_path=Path(energy_path) if energy_path else None,
+            )
+            if not segments:
+                logger.info("No viral segments found for %s", source.id)
+                return []
+            return [("render", {"source": _dump(source), "segments": [_dump(segment) for segment in segments]})]
+
+        segments = [ViralSegment.parse_obj(segment) for segment in payload["segments"]]
+        if task.stage == "render":
+            shorts = await asyncio.to_thread(pipeline.render_segments, source, segments)
+            return [
+                (
+                    "upload",
+                    {
+                        "source": _dump(source),
+                        "segments": payload["segments"],
+                        "shorts": [_dump(short) for short in shorts],
+                    },
+                )
+            ]
+
+        shorts = [RenderedShort.parse_obj(short) for short in payload["shorts"]]
+        result = await asyncio.to_thread(pipeline.publish, source, segments, shorts)
+        await pipeline.persist_results([result])
+        await asyncio.to_thread(pipeline.storage.collect_garbage)
+        return []
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a pipeline stage worker")
+    parser.add_argument(
+        "--stages",
+        default=",".join(STAGES),
+        help=f"Comma-separated stages this worker serves (default: {','.join(STAGES)})",
+    )
+    parser.add_argument("--queue-url", default=None, help="Override PIPELINE_QUEUE_URL")
+    parser.add_argument("--max-tasks", type=int, default=None, help="Exit after processing this many tasks")
+    parser.add_argument("--exit-when-idle", action="store_true", help="Exit once the queue has no matching tasks")
+    args = parser.parse_args(argv)
+
+    setup_logger("worker")
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    worker = StageWorker(stages, queue=get_task_queue(args.queue_url))
+    asyncio.run(worker.run(max_tasks=args.max_tasks, exit_when_idle=args.exit_when_idle))
+
+
+if __name__ == "__main__":
+    main()